@@ -0,0 +1,152 @@
+"""Cold-start benchmark for the app scripts.
+
+Each script is rendered once in a fresh interpreter with Streamlit's AppTest
+harness. The benchmark records the harness import time, the first-render time
+(which includes importing the page's own modules) and any heavy modules that
+got loaded. AppTest itself loads plotly and PIL, so deferred imports are
+checked separately in bare interpreters. One check runs only a page's import
+statements after `import streamlit`. The other imports the headless `chemlab`
+modules without Streamlit. It exits non-zero if a page is slower than the stored
+baseline by more than the tolerance, or if a page or the headless package
+eagerly loads a library it should defer.
+
+    python benchmarks/startup.py            # compare with startup_baseline.json
+    python benchmarks/startup.py --update   # record a new baseline
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, "benchmarks", "startup_baseline.json")
+SCRIPTS = ["home.py", "pages/Conductance_measurement.py", "pages/ElectroChemistry.py"]
+# never needed to render any page
+FORBIDDEN = ["matplotlib", "plotly.express", "scipy"]
+# deferred with chemlab.lazy: importing a page must not execute them, unless
+# `import streamlit` already did (it loads plotly.graph_objects and plotly.io)
+DEFERRED = ["PIL.Image", "plotly.graph_objects", "plotly.io", "streamlit_lottie"]
+# chemlab modules that need Streamlit; the rest must import without the deferred libraries
+STREAMLIT_MODULES = ["chemlab.ui", "chemlab.assets"]
+
+PROBE = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file({path!r}, default_timeout=120).run()
+t2 = time.perf_counter()
+loaded = [m for m in {forbidden!r} if m in sys.modules]
+print(json.dumps({{"import": t1 - t0, "first_render": t2 - t1,
+                   "exceptions": len(at.exception), "loaded": loaded}}))
+"""
+
+IMPORT_PROBE = r"""
+import ast, json, pkgutil, sys
+sys.path.insert(0, {root!r})
+checked = {checked!r}
+
+def executed():
+    # chemlab.lazy stand-ins stay out of sys.modules until first used
+    return {{m for m in checked if m in sys.modules}}
+
+if {path!r}:
+    import streamlit
+    before = executed()
+    with open({path!r}, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    nodes = [node for node in tree.body
+             if isinstance(node, (ast.Import, ast.ImportFrom))
+             or isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)
+             and getattr(node.value.func, "id", None) == "lazy_import"]
+    exec(compile(ast.Module(nodes, []), {path!r}, "exec"), {{}})
+else:
+    import chemlab
+    before = set()
+    for info in pkgutil.iter_modules(chemlab.__path__, "chemlab."):
+        if info.name not in {streamlit_modules!r}:
+            __import__(info.name)
+print(json.dumps(sorted(executed() - before)))
+"""
+
+
+def import_probe(script=None):
+    """Deferred or forbidden modules executed by importing `script` (or headless chemlab)."""
+    code = IMPORT_PROBE.format(root=ROOT, path=script and os.path.join(ROOT, script),
+                               checked=FORBIDDEN + DEFERRED, streamlit_modules=STREAMLIT_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def probe(script):
+    code = PROBE.format(root=ROOT, path=os.path.join(ROOT, script), forbidden=FORBIDDEN)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def measure(repeat):
+    results = {}
+    for script in SCRIPTS:
+        runs = [probe(script) for _ in range(repeat)]
+        results[script] = {
+            "import": statistics.median(r["import"] for r in runs),
+            "first_render": statistics.median(r["first_render"] for r in runs),
+            "exceptions": max(r["exceptions"] for r in runs),
+            "loaded": sorted({m for r in runs for m in r["loaded"]} | set(import_probe(script))),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="fail when a timing exceeds baseline x tolerance")
+    parser.add_argument("--update", action="store_true", help="write a new baseline")
+    args = parser.parse_args(argv)
+
+    results = measure(args.repeat)
+    for script, r in results.items():
+        print(f"{script:36s} import {r['import']:.3f}s  first render {r['first_render']:.3f}s"
+              + (f"  loaded {r['loaded']}" if r["loaded"] else ""))
+    headless = import_probe()
+    print(f"{'chemlab (headless)':36s}" + (f" loaded {headless}" if headless else " ok"))
+
+    if args.update:
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump({s: {k: round(r[k], 4) for k in ("import", "first_render")}
+                       for s, r in results.items()}, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {os.path.relpath(BASELINE, ROOT)}")
+        return 0
+
+    failures = []
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE, encoding="utf-8") as f:
+            baseline = json.load(f)
+    for script, r in results.items():
+        if r["exceptions"]:
+            failures.append(f"{script}: raised during first render")
+        if r["loaded"]:
+            failures.append(f"{script}: eagerly imported {', '.join(r['loaded'])}")
+        for key in ("import", "first_render"):
+            limit = baseline.get(script, {}).get(key)
+            if limit is not None and r[key] > limit * args.tolerance:
+                failures.append(f"{script}: {key} {r[key]:.3f}s > {limit:.3f}s x {args.tolerance}")
+
+    if headless:
+        failures.append(f"chemlab (headless): eagerly imported {', '.join(headless)}")
+
+    for failure in failures:
+        print("FAIL", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,363 @@
+"""Benchmark suite for the physics kernels, page reruns, figures and exports.
+
+Every case runs at each size from 10 to 10^6 rows that it supports and
+records the median time per call. Results are written to
+``benchmarks/results/<commit>.json`` so runs can be compared across commits.
+They are also checked against ``suite_baseline.json``, and the script exits
+non-zero when a case is slower than baseline x tolerance.
+
+    python benchmarks/suite.py                       # run, save, gate on the baseline
+    python benchmarks/suite.py -k kernels --max-rows 10000
+    python benchmarks/suite.py --compare benchmarks/results/<commit>.json
+    python benchmarks/suite.py --update              # record a new baseline
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+BASELINE = os.path.join(ROOT, "benchmarks", "suite_baseline.json")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+CASES = {}
+
+
+def bench(name, max_rows=SIZES[-1]):
+    """Register `setup(n) -> callable`; the callable is what gets timed."""
+    def register(setup):
+        CASES[name] = (setup, [n for n in SIZES if n <= max_rows])
+        return setup
+    return register
+
+
+def _rng():
+    return np.random.default_rng(0)
+
+
+# ---------------------------------------------------------------------
+# physics kernels
+# ---------------------------------------------------------------------
+@bench("kernels.kohlrausch")
+def _kohlrausch(n):
+    from chemlab.conductance import kohlrausch
+
+    conc = _rng().uniform(1e-4, 0.1, n)
+    return lambda: kohlrausch("NaCl", conc)
+
+
+@bench("kernels.temperature_factor")
+def _temperature_factor(n):
+    from chemlab.conductance import temperature_factor
+
+    temp = _rng().uniform(298, 338, n)
+    return lambda: temperature_factor(temp)
+
+
+@bench("kernels.conductance_mixed")
+def _conductance_mixed(n):
+    from chemlab.conductance import ELECTROLYTES, conductance
+
+    rng = _rng()
+    names = rng.choice(ELECTROLYTES, n)
+    conc, temp = rng.uniform(1e-4, 0.1, n), rng.uniform(298, 338, n)
+    return lambda: conductance(names, conc, temp)
+
+
+@bench("kernels.nernst")
+def _nernst(n):
+    from chemlab.nernst import conc_anode, nernst
+
+    cathode = _rng().uniform(1e-3, 0.1, n)
+    return lambda: nernst(conc_anode, cathode)
+
+
+@bench("kernels.nernst_activity")
+def _nernst_activity(n):
+    from chemlab.activity import nernst
+    from chemlab.nernst import conc_anode
+
+    rng = _rng()
+    cathode, temp = rng.uniform(1e-3, 0.1, n), rng.uniform(288, 318, n)
+    return lambda: nernst(conc_anode, cathode, temp, kno3=0.1)
+
+
+@bench("kernels.conductance_onsager")
+def _conductance_onsager(n):
+    from chemlab.activity import conductance
+    from chemlab.conductance import ELECTROLYTES
+
+    rng = _rng()
+    names = rng.choice(ELECTROLYTES, n)
+    conc, temp = rng.uniform(1e-4, 0.1, n), rng.uniform(298, 338, n)
+    return lambda: conductance(names, conc, temp)
+
+
+@bench("kernels.calibration")
+def _calibration(n):
+    from chemlab.nernst import calibrate, conc_anode, conc_from_emf, nernst
+
+    rng = _rng()
+    cathode = rng.uniform(1e-3, 0.1, n)
+    emf = nernst(conc_anode, cathode) + rng.normal(0, 1e-4, n)
+
+    def run():
+        m, b = calibrate(cathode, emf)
+        return conc_from_emf(emf, m, b)
+    return run
+
+
+@bench("kernels.online_fit")
+def _online_fit(n):
+    from chemlab.nernst import conc_anode, ln_ratio, nernst
+    from chemlab.regression import OnlineFit
+
+    cathode = _rng().uniform(1e-3, 0.1, n)
+    x, y = ln_ratio(conc_anode, cathode), nernst(conc_anode, cathode)
+
+    def run():
+        fit = OnlineFit.from_arrays(x, y)
+        return fit.predict(x), fit.inverse(y[0])
+    return run
+
+
+@bench("kernels.discharge", max_rows=100_000)
+def _discharge(n):
+    from chemlab.kinetics import discharge
+
+    return lambda: discharge((1.0, 10.0, 50.0, 200.0, 1000.0), hours=48, steps=n)
+
+
+@bench("kernels.titration")
+def _titration(n):
+    from chemlab.titration import equivalence_point, titration_curve
+
+    def run():
+        curve = titration_curve("CH3COOH", points=n)
+        return equivalence_point(curve["volume"], curve["corrected"])
+    return run
+
+
+# ---------------------------------------------------------------------
+# tables, figures and exports
+# ---------------------------------------------------------------------
+DILUTION_COLUMNS = ["Volume (mL)", "Concentration (M)", "Conductance Λ (S·cm²·mol⁻¹)",
+                    "Temperature (K)"]
+
+
+def _dilution(n):
+    from chemlab.conductance import T0, conductance
+    from chemlab.regression import OnlineFit
+    from chemlab.store import MeasurementTable
+
+    volume = np.arange(n) % 21 + 20
+    conc = 0.002 / (volume / 1000)
+    lam = conductance("NaCl", conc) + _rng().normal(0, 0.5, n)
+    table = MeasurementTable(DILUTION_COLUMNS, [int, float, float, int], capacity=n)
+    table.extend(volume, conc, lam, np.full(n, T0))
+    return table, OnlineFit.from_arrays(conc, lam)
+
+
+@bench("store.append", max_rows=100_000)
+def _append(n):
+    from chemlab.store import MeasurementTable
+
+    rows = [(20 + i % 21, 0.1, 100.0 + i % 7, 298) for i in range(n)]
+
+    def run():
+        table = MeasurementTable(DILUTION_COLUMNS, [int, float, float, int])
+        for row in rows:
+            table.append(*row)
+    return run
+
+
+@bench("store.to_frame")
+def _to_frame(n):
+    table, _ = _dilution(n)
+    return table.to_frame
+
+
+@bench("figures.dilution")
+def _figure(n):
+    from chemlab import figures
+
+    table, fit = _dilution(n)
+
+    def run():
+        figures.figure_cache.clear()  # time the build, not the cache hit
+        return figures.dilution_figure(table, fit)
+    return run
+
+
+@bench("export.csv")
+def _csv(n):
+    from chemlab import export
+
+    table, _ = _dilution(n)
+    return lambda: export._encode("csv", {"dilution": table})
+
+
+@bench("export.parquet")
+def _parquet(n):
+    from chemlab import export
+
+    table, _ = _dilution(n)
+    return lambda: export._encode("parquet", {"dilution": table})
+
+
+# ---------------------------------------------------------------------
+# full-page reruns
+# ---------------------------------------------------------------------
+@bench("apptest.conductance_rerun")
+def _conductance_rerun(n):
+    from streamlit.testing.v1 import AppTest
+
+    table, fit = _dilution(n)
+    at = AppTest.from_file(os.path.join(ROOT, "pages", "Conductance_measurement.py"),
+                           default_timeout=600)
+    at.run()
+    at.session_state["table2"] = table
+    at.session_state["fit2"] = fit
+    return at.run
+
+
+@bench("apptest.electrochemistry_rerun")
+def _electrochemistry_rerun(n):
+    from streamlit.testing.v1 import AppTest
+
+    from chemlab.nernst import conc_anode, ln_ratio, nernst
+    from chemlab.regression import OnlineFit
+    from chemlab.store import MeasurementTable
+
+    # n repeat readings of the three standards, as a long session would collect
+    labels = np.array(["0.1 M", "0.01 M", "0.001 M"], dtype=object)[np.arange(n) % 3]
+    conc = np.array([0.1, 0.01, 0.001])[np.arange(n) % 3]
+    emf = nernst(conc_anode, conc) + _rng().normal(0, 1e-3, n)
+    table = MeasurementTable(["Concentration (M)", "EMF (V)"], [object, float], capacity=n)
+    table.extend(labels, emf)
+    at = AppTest.from_file(os.path.join(ROOT, "pages", "ElectroChemistry.py"), default_timeout=600)
+    at.run()
+    at.session_state["exp_data"] = table
+    at.session_state["std_fit"] = OnlineFit.from_arrays(ln_ratio(conc_anode, conc), emf)
+    return at.run
+
+
+# ---------------------------------------------------------------------
+# runner
+# ---------------------------------------------------------------------
+def timeit(func, min_time, repeat):
+    """Median seconds per call over `repeat` batches of at least `min_time` each."""
+    func()  # warm-up
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    batches = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        batches.append((time.perf_counter() - start) / number)
+    return statistics.median(batches)
+
+
+def commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return out + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_cases(patterns, max_rows, min_time, repeat):
+    results = {}
+    for name, (setup, sizes) in CASES.items():
+        if patterns and not any(fnmatch.fnmatch(name, f"*{p}*") for p in patterns):
+            continue
+        for n in sizes:
+            if n > max_rows:
+                continue
+            key = f"{name}[{n}]"
+            results[key] = timeit(setup(n), min_time, repeat)
+            print(f"{key:44s} {results[key] * 1e3:12.4f} ms", flush=True)
+    return results
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("results", data)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="patterns", action="append", default=[],
+                        help="only run cases whose name contains this (repeatable)")
+    parser.add_argument("--max-rows", type=int, default=SIZES[-1])
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds per timing batch")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=1.5,
+                        help="fail when a timing exceeds reference x tolerance")
+    parser.add_argument("--compare", metavar="RESULTS",
+                        help="reference results file (default: suite_baseline.json)")
+    parser.add_argument("--update", action="store_true", help="write a new baseline")
+    args = parser.parse_args(argv)
+
+    results = run_cases(args.patterns, args.max_rows, args.min_time, args.repeat)
+    record = {"commit": commit(), "python": platform.python_version(),
+              "numpy": np.__version__, "machine": platform.machine(),
+              "results": {k: round(v, 9) for k, v in results.items()}}
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{record['commit']}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=2)
+        f.write("\n")
+    print(f"results written to {os.path.relpath(path, ROOT)}")
+
+    if args.update:
+        baseline = _load(BASELINE) if os.path.exists(BASELINE) else {}
+        baseline.update(record["results"])
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(baseline.items())), f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {os.path.relpath(BASELINE, ROOT)}")
+        return 0
+
+    reference_path = args.compare or BASELINE
+    if not os.path.exists(reference_path):
+        return 0
+    reference = _load(reference_path)
+    failures = []
+    for key, t in results.items():
+        ref = reference.get(key)
+        if ref is None:
+            continue
+        change = t / ref
+        flag = "FAIL" if change > args.tolerance else "    "
+        print(f"{flag} {key:44s} {change:6.2f}x vs {os.path.basename(reference_path)}")
+        if change > args.tolerance:
+            failures.append(key)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
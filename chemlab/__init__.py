@@ -0,0 +1 @@
+"""Shared simulation code for the ChemLabSimulator pages."""
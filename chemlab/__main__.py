@@ -0,0 +1,144 @@
+"""Command-line entry point: `python -m chemlab <experiment> [options]`."""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from chemlab import history, kinetics, simulate, sweep, titration
+
+
+def _add_out(parser, required=False):
+    parser.add_argument("-o", "--out", required=required,
+                        help="output .csv or .parquet (default: CSV to stdout)")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m chemlab",
+                                     description="Run ChemLabSimulator experiments without the browser.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("standards", help="Table 1: Λ of 0.1M HCl, NaCl, KCl")
+    p.add_argument("--conc", type=float, default=0.1)
+
+    p = sub.add_parser("dilution", help="Table 2: serial dilution of NaCl")
+    p.add_argument("--electrolyte", default="NaCl")
+    p.add_argument("--step", type=float, default=4)
+    p.add_argument("--max-volume", type=float, default=40)
+
+    p = sub.add_parser("temperature", help="Λ of 0.1M KCl vs temperature")
+    p.add_argument("--electrolyte", default="KCl")
+    p.add_argument("--temps", type=float, nargs="+", default=list(range(298, 339, 5)))
+
+    p = sub.add_parser("daniell", help="Daniell-cell EMF for CuSO₄ concentrations")
+    p.add_argument("--concs", type=float, nargs="+", default=[0.1, 0.01, 0.001])
+
+    p = sub.add_parser("discharge", help="Daniell-cell discharge through load resistances")
+    p.add_argument("--loads", type=float, nargs="+", default=list(kinetics.LOADS), help="ohms")
+    p.add_argument("--hours", type=float, default=24.0)
+    p.add_argument("--steps", type=int, default=kinetics.STEPS)
+    p.add_argument("--conc", type=float, default=0.1, help="initial [Cu²⁺] (M)")
+
+    p = sub.add_parser("titration", help="conductometric titration curve of an acid with a strong base")
+    p.add_argument("--acid", choices=sorted(titration.ACIDS), default="HCl")
+    p.add_argument("--base", choices=sorted(titration.BASES), default="NaOH")
+    p.add_argument("--acid-conc", type=float, default=0.1)
+    p.add_argument("--acid-volume", type=float, default=25.0, help="mL")
+    p.add_argument("--base-conc", type=float, default=0.1)
+    p.add_argument("--points", type=int, default=titration.POINTS)
+
+    p = sub.add_parser("stream", help="stream random readings to CSV/Parquet")
+    p.add_argument("experiment", choices=sorted(simulate.GENERATORS))
+    p.add_argument("--rows", type=int, default=1_000_000)
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--chunk-rows", type=int, default=simulate.CHUNK_ROWS)
+    _add_out(p, required=True)
+
+    p = sub.add_parser("sweep", help="grid sweep over a process pool")
+    p.add_argument("experiment", choices=["conductance", "daniell"])
+    p.add_argument("--electrolytes", nargs="+", default=["HCl", "NaCl", "KCl"])
+    p.add_argument("--conc-grid", type=float, nargs=3, metavar=("MIN", "MAX", "N"), default=[0.001, 0.1, 100])
+    p.add_argument("--ratio-grid", type=float, nargs=3, metavar=("MIN", "MAX", "N"), default=[0.01, 100, 100])
+    p.add_argument("--temp-grid", type=float, nargs=3, metavar=("MIN", "MAX", "N"), default=[298, 338, 41])
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--chunk-size", type=int, default=sweep.CHUNK_SIZE)
+    _add_out(p, required=True)
+
+    p = sub.add_parser("history", help="class-wide aggregates from a saved history database")
+    p.add_argument("--db", default=history.db_path(), required=history.db_path() is None,
+                   help="SQLite file (default: $CHEMLAB_DB)")
+    p.add_argument("experiment", nargs="?", choices=["standards", "dilution", "temperature", "emf"],
+                   help="aggregate one experiment (default: list run counts)")
+    p.add_argument("--by", choices=["label", "volume", "concentration", "temperature"], default="label")
+    p.add_argument("--since", type=float, default=None, help="only readings after this UNIX time")
+    _add_out(p)
+
+    for name in ("standards", "dilution", "temperature", "daniell", "discharge", "titration"):
+        _add_out(sub.choices[name])
+    return parser
+
+
+def _grid(spec):
+    lo, hi, num = spec
+    return np.linspace(lo, hi, int(num))
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == "stream":
+        simulate.stream_to_file(args.experiment, args.rows, args.out, args.seed, args.chunk_rows)
+        return 0
+
+    if args.command == "history":
+        hist = history.History(args.db)
+        df = hist.cohort(args.experiment, args.by, args.since) if args.experiment else hist.runs()
+        hist.close()
+        if args.out:
+            simulate.write_frame(df, args.out)
+        else:
+            df.to_csv(sys.stdout, index=False)
+        return 0
+
+    if args.command == "sweep":
+        temps = _grid(args.temp_grid)
+        progress = lambda done, total: print(f"\r{done}/{total} points", end="", file=sys.stderr)
+        if args.experiment == "conductance":
+            df = sweep.conductance_sweep(args.electrolytes, _grid(args.conc_grid), temps,
+                                         args.workers, args.chunk_size, progress)
+        else:
+            df = sweep.daniell_sweep(np.geomspace(*args.ratio_grid[:2], int(args.ratio_grid[2])), temps,
+                                     workers=args.workers, chunk_size=args.chunk_size, progress=progress)
+        print(file=sys.stderr)
+        simulate.write_frame(df, args.out)
+        return 0
+
+    if args.command == "standards":
+        df = simulate.standard_solutions(conc=args.conc)
+    elif args.command == "dilution":
+        df = simulate.serial_dilution(electrolyte=args.electrolyte, step=args.step, max_volume=args.max_volume)
+    elif args.command == "temperature":
+        df = simulate.temperature_series(args.temps, electrolyte=args.electrolyte)
+    elif args.command == "daniell":
+        df = simulate.daniell_cell(args.concs)
+    elif args.command == "titration":
+        curve = titration.titration_curve(args.acid, args.base, args.acid_conc, args.acid_volume,
+                                          args.base_conc, points=args.points)
+        fit = titration.equivalence_point(curve["volume"], curve["corrected"])
+        print(f"equivalence: {curve['equivalence']:.3f} mL (theory), "
+              + (f"{fit[0]:.3f} mL (intersecting lines)" if fit else "no break found"), file=sys.stderr)
+        df = pd.DataFrame({"Titrant (mL)": curve["volume"], "pH": curve["ph"],
+                           "κ (mS/cm)": curve["kappa"], "Corrected κ (mS/cm)": curve["corrected"]})
+    else:
+        result = kinetics.discharge(args.loads, args.hours, args.steps, args.conc)
+        df = kinetics.discharge_frame(result, args.loads)
+
+    if args.out:
+        simulate.write_frame(df, args.out)
+    else:
+        df.to_csv(sys.stdout, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""Process-wide cache for static reference tables and asset files.
+
+Entries are shared by every session and keyed on the file's mtime, so a rerun
+does no disk I/O or DataFrame construction unless the file on disk changed.
+Cached objects are shared: callers must not mutate them.
+"""
+import json
+import os
+
+import pandas as pd
+import streamlit as st
+
+from chemlab import electrolytes
+from chemlab.lazy import lazy_import
+
+Image = lazy_import("PIL.Image")
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _load_json(path, mtime):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def _load_image(path, mtime):
+    img = Image.open(path)
+    img.load()
+    return img
+
+
+def load_json(path):
+    """Parsed JSON file, re-read only when its mtime changes."""
+    return _load_json(path, os.path.getmtime(path))
+
+
+def load_image(path):
+    """Decoded PIL image, re-read only when its mtime changes."""
+    return _load_image(path, os.path.getmtime(path))
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _conductance_theory_tables(stamp):
+    cations, anions, salts = electrolytes.load().theory_frames()
+    table1 = pd.DataFrame({
+        "S.No": [1,2,3],
+        "Solution": ["0.1M HCl","0.1M NaCl","0.1M KCl"],
+        "Conductance Λ (S·cm²·mol⁻¹)": ["","",""],
+        "Temperature (K)": ["","",""]
+    })
+    table2 = pd.DataFrame({
+        "S.No": [1,2,3,4,5,6],
+        "Volume (mL)": ["20","24","28","32","36","40"],
+        "Concentration (M)": ["0.1000","0.0833","0.0714","0.0625","0.0556","0.0500"],
+        "Conductance Λ (S·cm²·mol⁻¹)": ["","","","","",""],
+        "Temperature (K)": ["","","","","",""]
+    })
+    return {"cations": cations, "anions": anions, "salts": salts,
+            "table1": table1, "table2": table2}
+
+
+def conductance_theory_tables():
+    """Reference and blank observation tables for the Conductance Theory tab.
+
+    The ion and salt tables come from the electrolyte database and are rebuilt
+    when its catalogue changes.
+    """
+    return _conductance_theory_tables(electrolytes.catalogue_stamp())
@@ -0,0 +1,50 @@
+"""Kohlrausch conductance model for the Conductance Measurement page.
+
+All functions broadcast over NumPy arrays, so a whole concentration x
+temperature grid is evaluated in one pass instead of one `math.sqrt` per point.
+Λ°, the Kohlrausch slope k and the temperature coefficient α of each
+electrolyte come from the electrolyte database (`chemlab.electrolytes`).
+"""
+import numpy as np
+
+from chemlab import electrolytes
+
+# constants
+T0 = 298
+alpha = 0.015  # K^-1, default for the page's electrolytes (see data/salts.csv)
+
+# the electrolytes measured in the page's experiments
+ELECTROLYTES = ("HCl", "NaCl", "KCl")
+
+
+def coefficients(electrolyte):
+    """Return (Λ0, k, α) arrays shaped like `electrolyte` (a name or array of names)."""
+    return electrolytes.load().coefficients(electrolyte)
+
+
+def kohlrausch(electrolyte, conc):
+    """Λ = Λ0 - k·√C at the reference temperature T0."""
+    lam0, k, _ = coefficients(electrolyte)
+    return lam0 - k * np.sqrt(np.asarray(conc, dtype=float))
+
+
+def temperature_factor(temp, alpha=alpha):
+    """Linear correction 1 + α(T - T0)."""
+    return 1 + alpha * (np.asarray(temp, dtype=float) - T0)
+
+
+def conductance(electrolyte, conc, temp=T0):
+    """Molar conductance Λ (S·cm²·mol⁻¹); arguments broadcast against each other."""
+    lam0, k, a = coefficients(electrolyte)
+    return (lam0 - k * np.sqrt(np.asarray(conc, dtype=float))) * temperature_factor(temp, a)
+
+
+def conductance_grid(electrolytes, concs, temps=(T0,)):
+    """Λ over the full electrolyte x concentration x temperature grid.
+
+    Returns an array of shape (len(electrolytes), len(concs), len(temps)).
+    """
+    names = np.asarray(electrolytes).reshape(-1, 1, 1)
+    concs = np.asarray(concs, dtype=float).reshape(1, -1, 1)
+    temps = np.asarray(temps, dtype=float).reshape(1, 1, -1)
+    return conductance(names, concs, temps)
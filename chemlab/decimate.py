@@ -0,0 +1,49 @@
+"""Server-side downsampling of long series before they are sent to the browser.
+
+`lttb` (Largest-Triangle-Three-Buckets) keeps the visual shape of a line and
+returns indices into the input arrays, so any column can be sliced with them.
+`envelope` reduces a band to the per-bucket extremes of its edges, fully
+vectorized.
+"""
+import numpy as np
+
+
+def _bucket_ids(n, n_buckets):
+    return (np.arange(n) * n_buckets) // n
+
+
+def lttb(x, y, n_out):
+    """Indices chosen by Largest-Triangle-Three-Buckets; first and last points are kept."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < len(edges) else n
+        cx, cy = x[hi:nxt_hi].mean(), y[hi:nxt_hi].mean()
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def envelope(x, lo, hi, n_out):
+    """Bucketed (x, min lo, max hi) envelope of a band, at most n_out points per edge."""
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if n <= n_out:
+        return x, np.asarray(lo, dtype=float), np.asarray(hi, dtype=float)
+    buckets = _bucket_ids(n, n_out)
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    return (np.add.reduceat(x, starts) / counts,
+            np.minimum.reduceat(np.asarray(lo, dtype=float), starts),
+            np.maximum.reduceat(np.asarray(hi, dtype=float), starts))
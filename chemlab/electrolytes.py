@@ -0,0 +1,223 @@
+"""Electrolyte database: ion conductivities, salts and temperature coefficients.
+
+The text catalogue in ``chemlab/data`` (``ions.csv`` and ``salts.csv``) is
+compiled once into flat NumPy arrays plus a name -> row index, and cached
+both in-process and as ``data/compiled/electrolytes.npz``. The compiled form
+is rebuilt only when a CSV changes. Lookups by name are O(1), and
+`coefficients` resolves whole arrays of names at once.
+
+Limiting equivalent conductivities follow Kohlrausch's law of independent ion
+migration, Λ° = λ°₊ + λ°₋. Salts listed in ``salts.csv`` may override Λ°,
+the Kohlrausch slope k and the temperature coefficient α with tabulated
+values. Every other cation/anion pair is derived from its ions. Such salts
+take k from the Onsager limiting-law estimate for a 1:1 electrolyte at 25 °C,
+and α as the λ-weighted mean of the ion coefficients.
+
+Every salt is modelled as a fully dissociated strong electrolyte with the
+1:1 slope above. That is wrong for weak acids and bases, meaningless for
+insoluble pairs (AgCl, Cu(OH)₂), and badly off for 2:1 and 2:2 salts, which
+need charge factors. The ``lab`` column of ``salts.csv`` marks the soluble,
+strong 1:1 electrolytes that the student experiments offer (`lab_salts`).
+"""
+import csv
+import math
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# Onsager limiting slope k = A + B·Λ° for a 1:1 electrolyte in water at 25 °C
+ONSAGER_A = 60.2
+ONSAGER_B = 0.229
+
+# water and the bisulfate ion are not salts
+_SKIPPED_PAIRS = {("H+", "OH-"), ("H+", "HSO4-")}
+
+_SUBSCRIPTS = str.maketrans("0123456789", "₀₁₂₃₄₅₆₇₈₉")
+
+
+def _group(formula, count):
+    if count == 1:
+        return formula
+    polyatomic = sum(ch.isupper() for ch in formula) > 1
+    return (f"({formula})" if polyatomic else formula) + str(count)
+
+
+def _float(value):
+    return float(value) if value not in ("", None) else math.nan
+
+
+def _read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def compile_catalogue(data_dir=DATA_DIR):
+    """Parse the CSV catalogue into a dict of flat NumPy arrays."""
+    ions = _read_csv(os.path.join(data_dir, "ions.csv"))
+    ion_row = {r["key"]: r for r in ions}
+
+    salts = []
+    for r in _read_csv(os.path.join(data_dir, "salts.csv")):
+        salts.append((r["key"], r["cation"], r["anion"], _float(r["lambda0"]),
+                      _float(r["k"]), _float(r["alpha"]), True, r["theory"] == "1", r["lab"] == "1"))
+    listed = {(s[1], s[2]) for s in salts}
+    cations = [r for r in ions if int(r["charge"]) > 0]
+    anions = [r for r in ions if int(r["charge"]) < 0]
+    for c in cations:
+        for a in anions:
+            if (c["key"], a["key"]) in listed or (c["key"], a["key"]) in _SKIPPED_PAIRS:
+                continue
+            zc, za = int(c["charge"]), -int(a["charge"])
+            g = math.gcd(zc, za)
+            key = _group(c["formula"], za // g) + _group(a["formula"], zc // g)
+            salts.append((key, c["key"], a["key"], math.nan, math.nan, math.nan, False, False, False))
+
+    ion_lambda = {k: float(r["lambda0"]) for k, r in ion_row.items()}
+    ion_alpha = {k: float(r["alpha"]) for k, r in ion_row.items()}
+    n = len(salts)
+    lam0 = np.empty(n)
+    k = np.empty(n)
+    alpha = np.empty(n)
+    for i, (_, cat, an, l0, kk, a, *_) in enumerate(salts):
+        lc, la = ion_lambda[cat], ion_lambda[an]
+        lam0[i] = lc + la if math.isnan(l0) else l0
+        k[i] = ONSAGER_A + ONSAGER_B * lam0[i] if math.isnan(kk) else kk
+        alpha[i] = (lc * ion_alpha[cat] + la * ion_alpha[an]) / (lc + la) if math.isnan(a) else a
+
+    return {
+        "ion_key": np.array([r["key"] for r in ions]),
+        "ion_display": np.array([r["display"] for r in ions]),
+        "ion_charge": np.array([int(r["charge"]) for r in ions]),
+        "ion_lambda0": np.array([float(r["lambda0"]) for r in ions]),
+        "ion_alpha": np.array([float(r["alpha"]) for r in ions]),
+        "ion_theory": np.array([r["theory"] == "1" for r in ions]),
+        "salt_key": np.array([s[0] for s in salts]),
+        "salt_display": np.array([s[0].translate(_SUBSCRIPTS) for s in salts]),
+        "salt_cation": np.array([s[1] for s in salts]),
+        "salt_anion": np.array([s[2] for s in salts]),
+        "salt_lambda0": lam0,
+        "salt_k": k,
+        "salt_alpha": alpha,
+        "salt_tabulated": np.array([s[6] for s in salts]),
+        "salt_theory": np.array([s[7] for s in salts]),
+        "salt_lab": np.array([s[8] for s in salts]),
+    }
+
+
+class ElectrolyteDB:
+    """Indexed, read-only view over a compiled catalogue."""
+
+    __slots__ = ("arrays", "_ion_index", "_salt_index")
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self._ion_index = {str(k): i for i, k in enumerate(arrays["ion_key"])}
+        self._salt_index = {str(k): i for i, k in enumerate(arrays["salt_key"])}
+
+    def __contains__(self, salt):
+        return salt in self._salt_index
+
+    def __len__(self):
+        return len(self._salt_index)
+
+    @property
+    def salt_names(self):
+        return list(self._salt_index)
+
+    @property
+    def lab_salts(self):
+        """Soluble strong 1:1 electrolytes offered in the experiments, in catalogue order."""
+        return [str(k) for k in self.arrays["salt_key"][self.arrays["salt_lab"]]]
+
+    def salt_index(self, names):
+        """Row indices for a name or array of names (KeyError on unknown salts)."""
+        names = np.asarray(names)
+        uniq, inverse = np.unique(names, return_inverse=True)
+        rows = np.array([self._salt_index[str(s)] for s in uniq], dtype=int)
+        return rows[inverse].reshape(names.shape)
+
+    def coefficients(self, names):
+        """(Λ°, k, α) arrays shaped like `names`."""
+        rows = self.salt_index(names)
+        a = self.arrays
+        return a["salt_lambda0"][rows], a["salt_k"][rows], a["salt_alpha"][rows]
+
+    def salt(self, name):
+        """All catalogue fields of one salt."""
+        i = self._salt_index[name]
+        return {f[5:]: self.arrays[f][i].item() for f in self.arrays if f.startswith("salt_")}
+
+    def ion(self, name):
+        """All catalogue fields of one ion."""
+        i = self._ion_index[name]
+        return {f[4:]: self.arrays[f][i].item() for f in self.arrays if f.startswith("ion_")}
+
+    def limiting_conductance(self, cation, anion):
+        """Kohlrausch's law: Λ° = λ°₊ + λ°₋ from the ion table."""
+        lam = self.arrays["ion_lambda0"]
+        return lam[self._ion_index[cation]] + lam[self._ion_index[anion]]
+
+    def display_name(self, name):
+        return str(self.arrays["salt_display"][self._salt_index[name]])
+
+    def theory_frames(self):
+        """Cations, anions and tabulated salts as shown in the Theory tab."""
+        a = self.arrays
+        shown = a["ion_theory"]
+        cat = shown & (a["ion_charge"] > 0)
+        an = shown & (a["ion_charge"] < 0)
+        salts = a["salt_theory"]
+        label = "Λ (S·cm²·mol⁻¹)"
+        return (pd.DataFrame({"Cation": a["ion_display"][cat], label: a["ion_lambda0"][cat]}),
+                pd.DataFrame({"Anion": a["ion_display"][an], label: a["ion_lambda0"][an]}),
+                pd.DataFrame({"Salt": a["salt_display"][salts], label: a["salt_lambda0"][salts]}))
+
+
+_lock = threading.Lock()
+_loaded = {}
+
+
+def catalogue_stamp(data_dir=DATA_DIR):
+    """Modification times of the catalogue files, used as a cache key."""
+    return tuple(os.path.getmtime(os.path.join(data_dir, f)) for f in ("ions.csv", "salts.csv"))
+
+
+def _load_compiled(path, stamp):
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            if tuple(npz["_stamp"]) != stamp:
+                return None
+            return {k: npz[k] for k in npz.files if k != "_stamp"}
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _save_compiled(path, arrays, stamp):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = path + f".{os.getpid()}.tmp.npz"
+        np.savez(tmp, _stamp=np.array(stamp), **arrays)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # read-only install: keep the in-memory copy only
+
+
+def load(data_dir=DATA_DIR):
+    """The electrolyte database, recompiled only when the catalogue changes."""
+    stamp = catalogue_stamp(data_dir)
+    with _lock:
+        cached = _loaded.get(data_dir)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        compiled = os.path.join(data_dir, "compiled", "electrolytes.npz")
+        arrays = _load_compiled(compiled, stamp)
+        if arrays is None:
+            arrays = compile_catalogue(data_dir)
+            _save_compiled(compiled, arrays, stamp)
+        db = ElectrolyteDB(arrays)
+        _loaded[data_dir] = (stamp, db)
+        return db
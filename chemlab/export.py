@@ -0,0 +1,146 @@
+"""On-demand exports of measurement tables: CSV, Parquet and ZIP/XLSX lab reports.
+
+Nothing is serialized until a download is requested. Tables are written
+`CHUNK_ROWS` rows at a time straight into the output buffer. The encoded bytes
+are kept in a process-wide LRU keyed on the tables' fingerprints, so a repeat
+download of unchanged data costs nothing.
+"""
+import hashlib
+import importlib.util
+import io
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+
+import pandas as pd
+
+CHUNK_ROWS = 50_000
+CACHE_BYTES = int(os.environ.get("CHEMLAB_EXPORT_CACHE_MB", 64)) * 2**20
+
+# format -> (file extension, MIME type, needs a single table)
+FORMATS = {
+    "csv": ("csv", "text/csv", True),
+    "parquet": ("parquet", "application/vnd.apache.parquet", True),
+    "zip": ("zip", "application/zip", False),
+    "xlsx": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", False),
+}
+_REQUIRES = {"parquet": "pyarrow", "xlsx": "openpyxl"}
+
+
+def available(fmt):
+    """False when the optional package a format needs is not installed."""
+    module = _REQUIRES.get(fmt)
+    return module is None or importlib.util.find_spec(module) is not None
+
+
+def _frames(source, chunk_rows):
+    if isinstance(source, pd.DataFrame):
+        if len(source) == 0:
+            return iter([source])
+        return (source.iloc[i:i + chunk_rows] for i in range(0, len(source), chunk_rows))
+    return source.iter_frames(chunk_rows) if len(source) else iter([source.to_frame()])
+
+
+def _fingerprint(source):
+    if isinstance(source, pd.DataFrame):
+        # digest of the row hashes in order, so reordered rows get a new key
+        rows = pd.util.hash_pandas_object(source, index=False).to_numpy()
+        return (tuple(source.columns), len(source), hashlib.blake2b(rows.tobytes()).digest())
+    return source.fingerprint()
+
+
+def write_csv(source, out, chunk_rows=CHUNK_ROWS):
+    """Write a table to a binary file object as UTF-8 CSV, one chunk at a time."""
+    for i, frame in enumerate(_frames(source, chunk_rows)):
+        out.write(frame.to_csv(index=False, header=i == 0).encode("utf-8"))
+
+
+def write_parquet(source, out, chunk_rows=CHUNK_ROWS):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if isinstance(source, pd.DataFrame):
+        table = pa.Table.from_pandas(source, preserve_index=False)
+    else:
+        table = source.to_arrow()
+    pq.write_table(table, out, row_group_size=chunk_rows)
+
+
+def write_zip(tables, out, chunk_rows=CHUNK_ROWS):
+    """One CSV member per table, each streamed into the archive."""
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, source in tables.items():
+            with zf.open(f"{name}.csv", "w") as member:
+                write_csv(source, member, chunk_rows)
+
+
+def write_xlsx(tables, out, chunk_rows=CHUNK_ROWS):
+    """One worksheet per table."""
+    with pd.ExcelWriter(out, engine="openpyxl") as writer:
+        for name, source in tables.items():
+            row = 0
+            for i, frame in enumerate(_frames(source, chunk_rows)):
+                frame.to_excel(writer, sheet_name=name[:31], startrow=row, header=i == 0, index=False)
+                row += len(frame) + (i == 0)
+
+
+def _encode(fmt, tables):
+    buf = io.BytesIO()
+    if fmt == "zip":
+        write_zip(tables, buf)
+    elif fmt == "xlsx":
+        write_xlsx(tables, buf)
+    else:
+        (source,) = tables.values()
+        (write_csv if fmt == "csv" else write_parquet)(source, buf)
+    return buf.getvalue()
+
+
+class _ByteCache:
+    """Thread-safe LRU bounded by the total size of the cached payloads."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is not None:
+                self._items.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._items:
+                return
+            self._items[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, old = self._items.popitem(last=False)
+                self._size -= len(old)
+
+
+_cache = _ByteCache(CACHE_BYTES)
+
+
+def encode(fmt, tables):
+    """Encoded file bytes for `tables` ({name: MeasurementTable or DataFrame}).
+
+    csv and parquet take exactly one table; zip and xlsx bundle all of them.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}")
+    if FORMATS[fmt][2] and len(tables) != 1:
+        raise ValueError(f"{fmt} export takes exactly one table")
+    key = (fmt, tuple((name, _fingerprint(source)) for name, source in tables.items()))
+    data = _cache.get(key)
+    if data is None:
+        data = _encode(fmt, tables)
+        _cache.put(key, data)
+    return data
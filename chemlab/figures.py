@@ -0,0 +1,301 @@
+"""Plotly figures for the Plots tabs, memoized on a fingerprint of their data.
+
+Figures are shared across sessions through a process-wide LRU, so an unchanged
+table skips figure construction and the trend-line fit on every rerun.
+Cached figures must not be mutated by callers.
+
+Series longer than `POINT_BUDGET` are decimated on the server (LTTB for
+measured lines, a min/max envelope for bands), and series longer than
+`WEBGL_THRESHOLD` are drawn with `Scattergl`. Both can be overridden with the
+CHEMLAB_POINT_BUDGET and CHEMLAB_WEBGL_THRESHOLD environment variables.
+"""
+import functools
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from chemlab import noise as mc
+from chemlab.conductance import T0, conductance
+from chemlab.decimate import envelope, lttb
+from chemlab.lazy import lazy_import
+from chemlab.nernst import conc_anode, nernst
+
+go = lazy_import("plotly.graph_objects")
+pio = lazy_import("plotly.io")
+
+POINT_BUDGET = int(os.environ.get("CHEMLAB_POINT_BUDGET", 2000))
+WEBGL_THRESHOLD = int(os.environ.get("CHEMLAB_WEBGL_THRESHOLD", 1000))
+
+LAMBDA_LABEL = "Conductance Λ (S·cm²·mol⁻¹)"
+
+
+class FigureCache:
+    """Thread-safe LRU of built figures keyed on (figure kind, data fingerprint)."""
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            fig = self._items.get(key)
+            if fig is not None:
+                self._items.move_to_end(key)
+                return fig
+        fig = build()
+        with self._lock:
+            self._items[key] = fig
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+        return fig
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+figure_cache = FigureCache()
+
+
+def fingerprint(data):
+    """Cheap hash of a MeasurementTable or a sequence of measurement tuples."""
+    if hasattr(data, "fingerprint"):
+        return data.fingerprint()
+    return hash(tuple(data))
+
+
+def stream(data):
+    """Noise stream id of `data`; unlike `fingerprint` (salted `hash`) it is the same in
+    every process, so a seeded band reproduces after a restart or in a spawned worker."""
+    if hasattr(data, "digest"):
+        return data.digest()
+    return mc.stream_id(*data)
+
+
+def _trend(x, fit):
+    # a straight line needs only its end points
+    xfit = np.array([x.min(), x.max()])
+    return xfit, fit.predict(xfit)
+
+
+def _trace_type(n):
+    return go.Scattergl if n > WEBGL_THRESHOLD else go.Scatter
+
+
+def _series(x, y, **kwargs):
+    """Trace for a measured series, LTTB-decimated to the point budget when longer."""
+    n = len(x)
+    if n > POINT_BUDGET:
+        order = np.argsort(x, kind="stable")
+        x, y = x[order], y[order]
+        keep = lttb(x, y, POINT_BUDGET)
+        x, y = x[keep], y[keep]
+    return _trace_type(n)(x=x, y=y, **kwargs)
+
+
+def _trend_name(fit):
+    return f"Trend (R² = {fit.r2:.4f})" if fit.r2 == fit.r2 else "Trend"
+
+
+def _add_band(fig, x, lo, hi, name="95% instrument band"):
+    order = np.argsort(x)
+    trace = _trace_type(len(x))
+    x, lo, hi = envelope(x[order], lo[order], hi[order], POINT_BUDGET)
+    fig.add_trace(trace(x=x, y=hi, mode="lines", line=dict(width=0),
+                        showlegend=False, hoverinfo="skip"))
+    fig.add_trace(trace(x=x, y=lo, mode="lines", line=dict(width=0), fill="tonexty",
+                        fillcolor="rgba(99,110,250,0.2)", name=name))
+
+
+def _build_dilution(table, fit, noise=None, law=None):
+    # copies: cached figures must not alias the table's growing buffers
+    conc = np.array(table.column("Concentration (M)"), dtype=float)
+    lam = np.array(table.column(LAMBDA_LABEL), dtype=float)
+
+    fig = go.Figure()
+    if noise:
+        n, seed = noise
+        rng = mc.make_rng(seed, stream(table))
+        _, _, lo, hi = mc.summarize(mc.conductance_readings(rng, "NaCl", conc, T0, n,
+                                                           law=law or conductance))
+        _add_band(fig, conc, lo, hi)
+    fig.add_trace(_series(conc, lam, mode="markers+lines", name="Measured"))
+
+    xfit, yfit = _trend(conc, fit)
+    fig.add_trace(go.Scatter(x=xfit,y=yfit,mode="lines",line=dict(dash="dash"),name=_trend_name(fit)))
+
+    fig.update_layout(title="NaCl: Variation of Conductance with Concentration",
+                      xaxis_title="Concentration (M)",
+                      yaxis_title=LAMBDA_LABEL,
+                      template="plotly_white")
+    fig.update_xaxes(autorange="reversed")
+    return fig
+
+
+def _build_temperature(table, fit, noise=None, law=None):
+    temp = np.array(table.column("Temperature (K)"), dtype=float)
+    lam = np.array(table.column(LAMBDA_LABEL), dtype=float)
+
+    fig = go.Figure()
+    if noise:
+        n, seed = noise
+        rng = mc.make_rng(seed, stream(table))
+        _, _, lo, hi = mc.summarize(mc.conductance_readings(rng, "KCl", 0.1, temp, n,
+                                                           law=law or conductance))
+        _add_band(fig, temp, lo, hi)
+    fig.add_trace(_series(temp, lam, mode="markers+lines", name="Measured"))
+
+    if len(temp)>=2:
+        xfit, yfit = _trend(temp, fit)
+        fig.add_trace(go.Scatter(x=xfit,y=yfit,mode="lines",line=dict(dash="dash"),name=_trend_name(fit)))
+
+    fig.update_layout(title="KCl: Conductance vs Temperature",
+                      xaxis_title="Temperature (K)",
+                      yaxis_title=LAMBDA_LABEL,
+                      template="plotly_white")
+    return fig
+
+
+def _build_emf(points, fit, noise=None, law=None):
+    labels = [p[0] for p in points]
+    x_vals = np.array([p[1] for p in points])
+    emf_vals = np.array([p[2] for p in points])
+
+    fig = go.Figure()
+    if noise:
+        n, seed = noise
+        cathode = conc_anode / np.exp(x_vals)
+        rng = mc.make_rng(seed, stream(points))
+        _, _, lo, hi = mc.summarize(mc.emf_readings(rng, cathode, n=n, law=law or nernst))
+        _add_band(fig, x_vals, lo, hi)
+    fig.add_trace(_series(x_vals, emf_vals, mode='lines+markers', name='Data Points',
+                          hovertemplate='ln([Zn²⁺]/[Cu²⁺]): %{x:.2f}<br>EMF: %{y:.3f} V<extra></extra>'))
+    if "Sample" in labels:
+        i = labels.index("Sample")
+        fig.add_vline(x=x_vals[i], line_dash="dash", annotation_text="Sample",
+                      annotation_position="top right")
+    fig.update_layout(
+        title="EMF vs ln Concentration Ratio",
+        xaxis_title="ln([Zn²⁺]/[Cu²⁺])",
+        yaxis_title="EMF (V)",
+        showlegend=False
+    )
+    return fig
+
+
+def _build_discharge(result, loads):
+    hours = result["time"] / 3600.0
+    fig = go.Figure()
+    for load, emf in zip(loads, result["emf"]):
+        fig.add_trace(_series(hours, emf, mode="lines", name=f"{load:g} Ω",
+                              hovertemplate="t = %{x:.2f} h<br>EMF: %{y:.4f} V<extra></extra>"))
+    fig.update_layout(title="Daniell Cell Discharge under Load",
+                      xaxis_title="Time (h)",
+                      yaxis_title="EMF (V)",
+                      template="plotly_white")
+    return fig
+
+
+def _build_titration(volume, kappa, fit, v_max):
+    fig = go.Figure()
+    fig.add_trace(_series(volume, kappa, mode="markers+lines", marker=dict(size=4), name="Measured",
+                          hovertemplate="V = %{x:.2f} mL<br>κ: %{y:.3f} mS/cm<extra></extra>"))
+    if fit is not None:
+        v_eq, left, right = fit
+        xs = np.array([0.0, v_max])
+        for (m, b), name in ((left, "Before equivalence"), (right, "After equivalence")):
+            fig.add_trace(go.Scatter(x=xs, y=m * xs + b, mode="lines", line=dict(dash="dash"), name=name))
+        fig.add_vline(x=v_eq, line_dash="dot", annotation_text=f"V_eq ≈ {v_eq:.2f} mL",
+                      annotation_position="top left")
+    fig.update_layout(title="Conductometric Titration",
+                      xaxis_title="Titrant added (mL)",
+                      yaxis_title="Corrected κ (mS/cm)",
+                      xaxis_range=[0, v_max],
+                      template="plotly_white")
+    return fig
+
+
+def _stats(fig, points):
+    shown = max((len(t.x) for t in fig.data if t.x is not None), default=0)
+    return {"points": points, "shown": min(shown, points),
+            "webgl": any(t.type == "scattergl" for t in fig.data),
+            "bytes": len(pio.to_json(fig, validate=False))}
+
+
+def law_name(law):
+    """Stable cache key for a model function or a `functools.partial` of one (None: ideal)."""
+    if law is None:
+        return None
+    if isinstance(law, functools.partial):
+        return (law_name(law.func), law.args, tuple(sorted(law.keywords.items())))
+    return f"{law.__module__}.{law.__qualname__}"
+
+
+def _cached(kind, build, data, fit, noise, law=None):
+    key = fingerprint(data)
+
+    def build_with_stats():
+        fig = build(data, fit, noise, law)
+        return fig, _stats(fig, len(data))
+
+    return figure_cache.get_or_build((kind, key, noise, law_name(law)), build_with_stats)
+
+
+def describe(stats):
+    """One-line summary of what a figure sends to the browser."""
+    text = f"{stats['shown']:,} of {stats['points']:,} points"
+    if stats["webgl"]:
+        text += " (WebGL)"
+    return f"{text} · {stats['bytes'] / 1024:.1f} kB plot payload"
+
+
+def dilution_figure(table, fit, noise=None, law=None):
+    """Λ vs concentration from the `table2` store, with the trend line from its OnlineFit.
+
+    `noise` is an optional (replicates, seed) pair that adds a 95% instrument band,
+    simulated with `law` (default: the ideal model; e.g. `activity.conductance`).
+    Like the other builders, returns (figure, stats) where stats feed `describe`.
+    """
+    return _cached("dilution", _build_dilution, table, fit, noise, law)
+
+
+def temperature_figure(table, fit, noise=None, law=None):
+    """Λ vs temperature from the `temp_table` store, with the trend line from its OnlineFit."""
+    return _cached("temperature", _build_temperature, table, fit, noise, law)
+
+
+def emf_figure(points, fit=None, noise=None, law=None):
+    """EMF vs ln([Zn²⁺]/[Cu²⁺]) from (label, ln ratio, EMF) points."""
+    return _cached("emf", _build_emf, points, fit, noise, law)
+
+
+def titration_figure(volume, kappa, fit, v_max, key):
+    """Corrected κ vs titrant volume with the intersecting-line fit, if any.
+
+    `key` identifies the readings (e.g. the titration settings and burette
+    position) for the cache.
+    """
+    def build():
+        fig = _build_titration(volume, kappa, fit, v_max)
+        return fig, _stats(fig, len(volume))
+
+    return figure_cache.get_or_build(("titration", key), build)
+
+
+def discharge_figure(result, loads, key):
+    """EMF vs time, one line per load, from a `kinetics.discharge` result.
+
+    `key` identifies the result (e.g. the discharge arguments) for the cache.
+    """
+    def build():
+        fig = _build_discharge(result, loads)
+        return fig, _stats(fig, result["time"].size)
+
+    return figure_cache.get_or_build(("discharge", key), build)
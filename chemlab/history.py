@@ -0,0 +1,198 @@
+"""Optional persistent measurement history in an embedded SQLite database.
+
+Set CHEMLAB_DB to a file path to turn it on. Every reading the pages take is
+then also written to one `measurements` table, tagged with the lab run it
+belongs to. Reopening a run restores its tables, and instructors can query
+aggregates over all runs in SQL, without loading raw rows into pandas.
+
+Writes are buffered and committed in batches, one transaction per
+`BATCH_SIZE` rows or per `FLUSH_SECONDS`, whichever comes first. Reads flush
+the buffer first, so they always see the latest readings. Connections come
+from a small pool and run in WAL mode, so readers do not block the writer.
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+BATCH_SIZE = 200
+FLUSH_SECONDS = 1.0
+POOL_SIZE = 4
+
+FIELDS = ("run_id", "experiment", "recorded_at", "label", "volume", "concentration", "value",
+          "temperature")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS measurements (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    experiment TEXT NOT NULL,
+    recorded_at REAL NOT NULL,
+    label TEXT,
+    volume REAL,
+    concentration REAL,
+    value REAL NOT NULL,
+    temperature REAL
+);
+CREATE INDEX IF NOT EXISTS ix_measurements_run ON measurements (run_id, experiment, recorded_at);
+CREATE INDEX IF NOT EXISTS ix_measurements_experiment ON measurements (experiment, recorded_at);
+CREATE INDEX IF NOT EXISTS ix_measurements_label ON measurements (experiment, label);
+"""
+
+
+def db_path():
+    return os.environ.get("CHEMLAB_DB") or None
+
+
+class ConnectionPool:
+    """Fixed set of SQLite connections shared across threads."""
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self._idle = queue.Queue()
+        for _ in range(size):
+            conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._idle.put(conn)
+        with self.connection() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; the block runs as one transaction."""
+        conn = self._idle.get()
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
+
+
+class History:
+    """Buffered writer plus the queries the pages and the CLI need."""
+
+    def __init__(self, path, batch_size=BATCH_SIZE, flush_seconds=FLUSH_SECONDS, pool_size=POOL_SIZE):
+        self.pool = ConnectionPool(path, pool_size)
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    # -- writing -----------------------------------------------------------
+    def record(self, run_id, experiment, value, label=None, volume=None, concentration=None,
+               temperature=None):
+        row = (run_id, experiment, time.time(), label, volume, concentration, float(value),
+               temperature)
+        with self._lock:
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+            if not full and self._timer is None:
+                self._timer = threading.Timer(self.flush_seconds, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+
+    def record_many(self, rows):
+        """Write (run_id, experiment, recorded_at, label, volume, concentration, value,
+        temperature) tuples in one transaction."""
+        with self.pool.connection() as conn:
+            conn.executemany(f"INSERT INTO measurements ({', '.join(FIELDS)}) "
+                             f"VALUES ({', '.join('?' * len(FIELDS))})", rows)
+
+    def flush(self):
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if rows:
+            self.record_many(rows)
+
+    def clear(self, run_id, experiments):
+        """Delete a run's readings for the given experiments."""
+        self.flush()
+        marks = ", ".join("?" * len(experiments))
+        with self.pool.connection() as conn:
+            conn.execute(f"DELETE FROM measurements WHERE run_id = ? AND experiment IN ({marks})",
+                         (run_id, *experiments))
+
+    # -- reading -----------------------------------------------------------
+    def query(self, sql, params=()):
+        """DataFrame of an arbitrary read-only query."""
+        self.flush()
+        with self.pool.connection() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def run(self, run_id, experiment, latest_per_label=False):
+        """A run's readings for one experiment in recording order.
+
+        With `latest_per_label`, only the newest reading of each label is kept,
+        matching upsert-style tables.
+        """
+        if latest_per_label:
+            sql = ("SELECT label, volume, concentration, value, temperature FROM measurements "
+                   "WHERE id IN (SELECT MAX(id) FROM measurements WHERE run_id = ? AND experiment = ? "
+                   "GROUP BY label) ORDER BY id")
+        else:
+            sql = ("SELECT label, volume, concentration, value, temperature FROM measurements "
+                   "WHERE run_id = ? AND experiment = ? ORDER BY recorded_at, id")
+        return self.query(sql, (run_id, experiment))
+
+    def cohort(self, experiment, by="label", since=None):
+        """Aggregates over every run, grouped by `by`: runs, readings, mean, SD, min and max."""
+        if by not in ("label", "volume", "concentration", "temperature"):
+            raise ValueError(f"cannot group by {by!r}")
+        where, params = "experiment = ?", [experiment]
+        if since is not None:
+            where += " AND recorded_at >= ?"
+            params.append(since)
+        sql = f"""
+            SELECT {by} AS "group", COUNT(DISTINCT run_id) AS runs, COUNT(*) AS readings,
+                   AVG(value) AS mean, AVG(value * value) AS mean_sq,
+                   MIN(value) AS min, MAX(value) AS max
+            FROM measurements WHERE {where}
+            GROUP BY {by} ORDER BY {by}"""
+        df = self.query(sql, params)
+        # sample SD from the aggregates (SQLite builds may lack SQRT)
+        n = df["readings"]
+        var = (df.pop("mean_sq") - df["mean"] ** 2).clip(lower=0) * n / (n - 1).clip(lower=1)
+        df.insert(4, "sd", var ** 0.5)
+        return df
+
+    def runs(self):
+        """Number of runs and readings per experiment."""
+        return self.query("SELECT experiment, COUNT(DISTINCT run_id) AS runs, COUNT(*) AS readings "
+                          "FROM measurements GROUP BY experiment ORDER BY experiment")
+
+    def close(self):
+        self.flush()
+        self.pool.close()
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get():
+    """The process-wide History for CHEMLAB_DB, or None when persistence is off."""
+    global _history
+    path = db_path()
+    if path is None:
+        return None
+    with _history_lock:
+        if _history is None or _history.pool.path != path:
+            _history = History(path)
+            atexit.register(_history.flush)
+        return _history
@@ -0,0 +1,48 @@
+"""Deferred imports for heavy plotting, imaging and animation libraries.
+
+`lazy_import` returns a stand-in right away, and the module is imported when
+one of its attributes is first used. A page that never opens the tab needing
+a library never pays for importing it.
+
+The first import is guarded by a lock, so sessions hitting the same library
+at the same time during a cold start all wait for one complete import.
+(`importlib.util.LazyLoader` exposes a half-initialised module to the other
+threads.)
+"""
+import importlib
+import importlib.util
+import sys
+import threading
+
+
+class LazyModule:
+    """Stand-in for module `name` that imports it on first attribute access."""
+
+    __slots__ = ("_name", "_module", "_lock")
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with self._lock:
+            if self._module is None:
+                self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._module or self._load(), attr)
+
+    def __repr__(self):
+        return f"<lazy module {self._name!r}{'' if self._module is None else ' (loaded)'}>"
+
+
+def lazy_import(name):
+    """Module `name`, imported on first attribute access."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if importlib.util.find_spec(name) is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    return LazyModule(name)
@@ -0,0 +1,40 @@
+"""Nernst equation for the Daniell cell on the ElectroChemistry page.
+
+Every function accepts scalars or NumPy arrays and broadcasts them, so whole
+calibration curves are computed in one call.
+"""
+import numpy as np
+
+# Constants
+Enot = 1.10
+R, T, n, F = 8.314, 298, 2, 96485
+conc_anode = 0.1
+
+
+def ln_ratio(anode, cathode):
+    """ln([Zn²⁺]/[Cu²⁺])."""
+    return np.log(np.asarray(anode, dtype=float) / np.asarray(cathode, dtype=float))
+
+
+def nernst(anode, cathode, T=T, n=n, E0=Enot):
+    """EMF (V) = E° - (RT/nF) ln([Zn²⁺]/[Cu²⁺])."""
+    T = np.asarray(T, dtype=float)
+    return E0 - (R * T) / (np.asarray(n) * F) * ln_ratio(anode, cathode)
+
+
+def cathode_from_emf(emf, anode=conc_anode, T=T, n=n, E0=Enot):
+    """Invert the ideal Nernst equation for [Cu²⁺]."""
+    x = (E0 - np.asarray(emf, dtype=float)) * np.asarray(n) * F / (R * np.asarray(T, dtype=float))
+    return np.asarray(anode, dtype=float) / np.exp(x)
+
+
+def calibrate(cathode, emf, anode=conc_anode):
+    """Least-squares line EMF = m·ln([Zn²⁺]/[Cu²⁺]) + b through the standards."""
+    m, b = np.polyfit(ln_ratio(anode, cathode), np.asarray(emf, dtype=float), 1)
+    return m, b
+
+
+def conc_from_emf(emf, m, b, anode=conc_anode):
+    """Read [Cu²⁺] off a calibration line for one or many measured EMFs."""
+    x = (np.asarray(emf, dtype=float) - b) / m
+    return np.asarray(anode, dtype=float) / np.exp(x)
@@ -0,0 +1,100 @@
+"""Monte-Carlo instrument noise for the simulators.
+
+Replicate readings are drawn in one batch from a NumPy `Generator`, so
+thousands of replicates per measurement cost a few array operations. Each
+session owns a seeded generator, which makes its stream of readings
+reproducible.
+"""
+import zlib
+
+import numpy as np
+
+from chemlab.conductance import T0, conductance
+from chemlab.nernst import T, conc_anode, nernst
+
+
+class InstrumentModel:
+    """Gaussian gain/offset error per replicate plus a drift offset per measurement.
+
+    `drift` is the SD of a zero-mean offset shared by all replicates of one
+    measurement (the instrument's zero wandering between readings). It widens
+    the spread without biasing the replicate mean, whatever the replicate count.
+    """
+
+    __slots__ = ("name", "rel_sd", "abs_sd", "drift")
+
+    def __init__(self, name, rel_sd, abs_sd, drift=0.0):
+        self.name = name
+        self.rel_sd = rel_sd
+        self.abs_sd = abs_sd
+        self.drift = drift
+
+    def __repr__(self):
+        return f"InstrumentModel({self.name!r}, rel_sd={self.rel_sd}, abs_sd={self.abs_sd}, drift={self.drift})"
+
+    def apply(self, rng, true):
+        gain = rng.normal(1.0, self.rel_sd, true.shape)
+        offset = rng.normal(0.0, self.abs_sd, true.shape)
+        readings = true * gain + offset
+        if self.drift:
+            readings += rng.normal(0.0, self.drift, true.shape[:-1] + (1,))
+        return readings
+
+
+# S·cm²·mol⁻¹ for the conductometer, V for the multimeter
+CONDUCTOMETER = InstrumentModel("conductometer", rel_sd=0.005, abs_sd=0.2, drift=1e-4)
+MULTIMETER = InstrumentModel("multimeter", rel_sd=0.0005, abs_sd=0.001, drift=1e-6)
+# mS/cm, for the conductivity cell used in titrations
+CONDUCTIVITY_METER = InstrumentModel("conductivity meter", rel_sd=0.005, abs_sd=0.01)
+TEMP_JITTER = 0.3  # K, thermometer/bath fluctuation
+
+
+def make_rng(*seed):
+    """Generator for a session; several ints (e.g. seed and data hash) may be combined."""
+    return np.random.default_rng([s & 0xFFFFFFFF for s in seed] if seed else None)
+
+
+def stream_id(*parts):
+    """Stable 32-bit id of a tuple of labels and numbers, for `make_rng`.
+
+    Unlike `hash`, it is the same in every process, so seeded runs reproduce.
+    """
+    return zlib.crc32(repr(parts).encode("utf-8"))
+
+
+def _jittered(rng, temp, shape, n, temp_jitter):
+    temp = np.broadcast_to(np.asarray(temp, dtype=float), shape)[..., None]
+    return temp + rng.normal(0.0, temp_jitter, shape + (n,))
+
+
+def conductance_readings(rng, electrolyte, conc, temp=T0, n=1,
+                         model=CONDUCTOMETER, temp_jitter=TEMP_JITTER, law=conductance):
+    """Replicate Λ readings, shape ``broadcast(electrolyte, conc, temp).shape + (n,)``.
+
+    `law` computes the true Λ (e.g. `chemlab.activity.conductance`).
+    """
+    shape = np.broadcast_shapes(np.shape(electrolyte), np.shape(conc), np.shape(temp))
+    names = np.broadcast_to(np.asarray(electrolyte), shape)[..., None]
+    conc = np.broadcast_to(np.asarray(conc, dtype=float), shape)[..., None]
+    true = law(names, conc, _jittered(rng, temp, shape, n, temp_jitter))
+    return model.apply(rng, true)
+
+
+def emf_readings(rng, cathode, anode=conc_anode, temp=T, n=1,
+                 model=MULTIMETER, temp_jitter=TEMP_JITTER, law=nernst):
+    """Replicate Daniell-cell EMF readings, shape ``broadcast(cathode, anode, temp).shape + (n,)``.
+
+    `law` computes the true EMF (e.g. `chemlab.activity.nernst`).
+    """
+    shape = np.broadcast_shapes(np.shape(cathode), np.shape(anode), np.shape(temp))
+    cathode = np.broadcast_to(np.asarray(cathode, dtype=float), shape)[..., None]
+    anode = np.broadcast_to(np.asarray(anode, dtype=float), shape)[..., None]
+    true = law(anode, cathode, _jittered(rng, temp, shape, n, temp_jitter))
+    return model.apply(rng, true)
+
+
+def summarize(readings, level=0.95):
+    """Mean, standard deviation and central `level` interval over the replicate axis."""
+    lo, hi = np.percentile(readings, [50 * (1 - level), 50 * (1 + level)], axis=-1)
+    sd = readings.std(axis=-1, ddof=1) if readings.shape[-1] > 1 else np.zeros(readings.shape[:-1])
+    return readings.mean(axis=-1), sd, lo, hi
@@ -0,0 +1,219 @@
+"""Opt-in per-rerun profiling: nested wall-clock spans plus tracemalloc memory.
+
+A `Profile` is started at the top of a page run and stopped at its end. While
+it is active in the current thread (each Streamlit session runs its script in
+its own thread), `span(name)` records a timed block and the memory allocated
+and peaked inside it. Outside a profile, `span` and `profiled` cost one
+attribute lookup.
+
+Profiles export as folded stacks ("a;b;c <microseconds>", as read by
+flamegraph.pl, speedscope and inferno) and as Chrome trace-event JSON
+(chrome://tracing, Perfetto).
+
+tracemalloc counters are process-wide, so memory figures include allocations
+from other sessions' threads running at the same time. A profile left open by a
+run that never reached `stop()` (an exception, a stopped or closed session)
+is stopped when its thread exits, so tracing does not stay on.
+"""
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+import weakref
+
+_local = threading.local()
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+
+
+def env_enabled():
+    return os.environ.get("CHEMLAB_PROFILE", "").lower() in ("1", "true", "yes", "on")
+
+
+def _start_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0:
+            tracemalloc.stop()
+
+
+class Span:
+    __slots__ = ("path", "start", "duration", "mem_start", "allocated", "peak")
+
+    def __init__(self, path, start, mem_start):
+        self.path = path
+        self.start = start
+        self.duration = 0.0
+        self.mem_start = mem_start
+        self.allocated = 0
+        self.peak = mem_start
+
+
+class Profile:
+    """Spans recorded during one script run."""
+
+    def __init__(self, name, snapshots=False, top=10):
+        self.name = name
+        self.spans = []
+        self.top_allocations = []
+        self._stack = []
+        self._snapshots = snapshots
+        self._top = top
+        self._first_snapshot = None
+        self._running = False
+        self.thread_id = threading.get_ident()
+
+    def _track_peak(self):
+        current, peak = tracemalloc.get_traced_memory()
+        for s in self._stack:
+            s.peak = max(s.peak, peak)
+        tracemalloc.reset_peak()
+        return current
+
+    def _enter(self, name):
+        current = self._track_peak()
+        path = (self._stack[-1].path if self._stack else ()) + (name,)
+        s = Span(path, time.perf_counter(), current)
+        self._stack.append(s)
+        return s
+
+    def _exit(self, s):
+        s.duration = time.perf_counter() - s.start
+        current = self._track_peak()
+        s.allocated = current - s.mem_start
+        s.peak -= s.mem_start
+        self._stack.pop()
+        self.spans.append(s)
+
+    def start(self):
+        self._running = True
+        _start_tracing()
+        if self._snapshots:
+            self._first_snapshot = tracemalloc.take_snapshot()
+        self._root = self._enter(self.name)
+
+    def stop(self):
+        if not self._running:
+            return
+        self._running = False
+        while self._stack:
+            self._exit(self._stack[-1])
+        if self._first_snapshot is not None:
+            diff = tracemalloc.take_snapshot().compare_to(self._first_snapshot, "lineno")
+            self.top_allocations = [(str(d.traceback[0]), d.size_diff, d.count_diff)
+                                    for d in diff[:self._top]]
+            self._first_snapshot = None
+        _stop_tracing()
+
+    @property
+    def total(self):
+        return self._root.duration
+
+    def rows(self):
+        """(path, seconds, self seconds, allocated bytes, peak bytes) in start order."""
+        child_time = {}
+        for s in self.spans:
+            parent = s.path[:-1]
+            child_time[parent] = child_time.get(parent, 0.0) + s.duration
+        ordered = sorted(self.spans, key=lambda s: s.start)
+        return [(s.path, s.duration, s.duration - child_time.get(s.path, 0.0), s.allocated, s.peak)
+                for s in ordered]
+
+    def folded(self):
+        """Folded stacks of self time in microseconds, one line per distinct stack."""
+        totals = {}
+        for path, _, self_time, _, _ in self.rows():
+            key = ";".join(p.replace(";", ",") for p in path)
+            totals[key] = totals.get(key, 0) + int(self_time * 1e6)
+        return "".join(f"{stack} {us}\n" for stack, us in totals.items() if us > 0)
+
+    def chrome_trace(self):
+        """Chrome trace-event JSON with one complete ("X") event per span."""
+        t0 = self._root.start
+        events = [{"name": s.path[-1], "cat": "chemlab", "ph": "X", "pid": os.getpid(),
+                   "tid": self.thread_id, "ts": (s.start - t0) * 1e6, "dur": s.duration * 1e6,
+                   "args": {"allocated": s.allocated, "peak": s.peak}}
+                  for s in sorted(self.spans, key=lambda s: s.start)]
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
+
+
+class _Span:
+    __slots__ = ("name", "profile", "span")
+
+    def __init__(self, name):
+        self.name = name
+        self.profile = getattr(_local, "profile", None)
+
+    def __enter__(self):
+        if self.profile is not None:
+            self.span = self.profile._enter(self.name)
+        return self
+
+    def __exit__(self, *exc):
+        if self.profile is not None and self.profile._stack and self.profile._stack[-1] is self.span:
+            self.profile._exit(self.span)
+        return False
+
+
+def span(name):
+    """Context manager timing a block in the current thread's profile, if any."""
+    return _Span(name)
+
+
+def profiled(name=None):
+    """Decorator: run the function inside `span(name or function name)`."""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if getattr(_local, "profile", None) is None:
+                return func(*args, **kwargs)
+            with _Span(label):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class _ThreadGuard:
+    """Lives only in the thread-local; when the thread ends it is freed and stops its profile."""
+
+    __slots__ = ("__weakref__",)
+
+
+def start(name="rerun", snapshots=False):
+    """Begin profiling the current thread, discarding a profile left open by an aborted run."""
+    stale = getattr(_local, "profile", None)
+    if stale is not None:
+        stale.stop()
+    profile = Profile(name, snapshots)
+    _local.profile = profile
+    _local.guard = _ThreadGuard()
+    weakref.finalize(_local.guard, profile.stop)
+    profile.start()
+    return profile
+
+
+def stop():
+    """Finish and return the current thread's profile (None if none is running)."""
+    profile = getattr(_local, "profile", None)
+    _local.profile = None
+    _local.guard = None
+    if profile is not None:
+        profile.stop()
+    return profile
+
+
+def active():
+    return getattr(_local, "profile", None) is not None
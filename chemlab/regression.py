@@ -0,0 +1,118 @@
+"""Online simple linear regression with uncertainties.
+
+`OnlineFit` keeps running means and centered sums of squares (Welford
+updates). Adding or removing a reading is O(1), and slope, intercept, R² and
+standard errors are available at any time without refitting.
+"""
+import math
+
+import numpy as np
+
+
+class OnlineFit:
+    """Least-squares line y = slope·x + intercept over a stream of (x, y) readings."""
+
+    __slots__ = ("n", "mean_x", "mean_y", "sxx", "sxy", "syy")
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.n = 0
+        self.mean_x = self.mean_y = 0.0
+        self.sxx = self.sxy = self.syy = 0.0
+
+    def add(self, x, y):
+        self.n += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.n
+        self.mean_y += dy / self.n
+        self.sxx += dx * (x - self.mean_x)
+        self.sxy += dx * (y - self.mean_y)
+        self.syy += dy * (y - self.mean_y)
+
+    def remove(self, x, y):
+        """Undo a previous `add(x, y)`."""
+        if self.n <= 1:
+            self.clear()
+            return
+        mean_x = (self.n * self.mean_x - x) / (self.n - 1)
+        mean_y = (self.n * self.mean_y - y) / (self.n - 1)
+        self.sxx -= (x - mean_x) * (x - self.mean_x)
+        self.sxy -= (x - mean_x) * (y - self.mean_y)
+        self.syy -= (y - mean_y) * (y - self.mean_y)
+        self.mean_x, self.mean_y = mean_x, mean_y
+        self.n -= 1
+
+    def add_many(self, xs, ys):
+        """Merge a batch of readings (Chan's parallel update)."""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        m = len(xs)
+        if m == 0:
+            return
+        bx, by = xs.mean(), ys.mean()
+        cx, cy = xs - bx, ys - by
+        n = self.n + m
+        dx, dy = bx - self.mean_x, by - self.mean_y
+        w = self.n * m / n
+        self.sxx += float(cx @ cx) + dx * dx * w
+        self.sxy += float(cx @ cy) + dx * dy * w
+        self.syy += float(cy @ cy) + dy * dy * w
+        self.mean_x += dx * m / n
+        self.mean_y += dy * m / n
+        self.n = n
+
+    @classmethod
+    def from_arrays(cls, xs, ys):
+        fit = cls()
+        fit.add_many(xs, ys)
+        return fit
+
+    @property
+    def slope(self):
+        return self.sxy / self.sxx if self.sxx > 0 else math.nan
+
+    @property
+    def intercept(self):
+        return self.mean_y - self.slope * self.mean_x
+
+    @property
+    def r2(self):
+        if self.sxx <= 0 or self.syy <= 0:
+            return math.nan
+        return self.sxy * self.sxy / (self.sxx * self.syy)
+
+    @property
+    def residual_var(self):
+        """s² = SSE / (n - 2); nan with fewer than three readings."""
+        if self.n < 3 or self.sxx <= 0:
+            return math.nan
+        return max(self.syy - self.sxy * self.sxy / self.sxx, 0.0) / (self.n - 2)
+
+    @property
+    def slope_se(self):
+        return math.sqrt(self.residual_var / self.sxx) if self.sxx > 0 else math.nan
+
+    @property
+    def intercept_se(self):
+        if self.sxx <= 0:
+            return math.nan
+        return math.sqrt(self.residual_var * (1 / self.n + self.mean_x ** 2 / self.sxx))
+
+    def predict(self, x):
+        return self.slope * np.asarray(x, dtype=float) + self.intercept
+
+    def inverse(self, y, y_var=None):
+        """x read off the line for a measured y, with its standard error.
+
+        Uses the classical calibration formula; `y_var` is the variance of the
+        measured y and defaults to the residual variance of the fit.
+        """
+        m = self.slope
+        x0 = (y - self.intercept) / m
+        s2 = self.residual_var
+        y_var = s2 if y_var is None else y_var
+        var = (y_var + s2 / self.n + s2 * (y - self.mean_y) ** 2 / (m * m * self.sxx)) / (m * m)
+        return x0, math.sqrt(var) if var == var else math.nan
@@ -0,0 +1,108 @@
+"""Headless versions of the page experiments, for bulk dataset generation.
+
+The functions return DataFrames with the same columns the pages show, using
+the same constants, so results match what a student would record in the UI.
+"""
+import numpy as np
+import pandas as pd
+
+from chemlab.conductance import ELECTROLYTES, T0, conductance
+from chemlab.nernst import T, conc_anode, ln_ratio, nernst
+
+LAMBDA = "Conductance Λ (S·cm²·mol⁻¹)"
+CHUNK_ROWS = 250_000
+
+
+def standard_solutions(electrolytes=ELECTROLYTES, conc=0.1):
+    """Table 1: Λ of each electrolyte at a fixed concentration and T0."""
+    names = np.asarray(electrolytes)
+    return pd.DataFrame({"Salt": names,
+                         LAMBDA: np.round(conductance(names, conc), 2),
+                         "Temperature (K)": T0})
+
+
+def serial_dilution(initial_conc=0.1, initial_volume=20, step=4, max_volume=40, electrolyte="NaCl"):
+    """Table 2: Λ after each water addition, from `initial_volume` up to `max_volume` mL."""
+    volumes = np.arange(initial_volume, max_volume + 1, step)
+    conc = np.round(initial_conc * initial_volume / volumes, 4)
+    lam = np.round(conductance(electrolyte, initial_conc * initial_volume / volumes), 2)
+    return pd.DataFrame({"Volume (mL)": volumes, "Concentration (M)": conc,
+                         LAMBDA: lam, "Temperature (K)": T0})
+
+
+def temperature_series(temps=range(298, 339, 5), electrolyte="KCl", conc=0.1):
+    """Λ of one solution over a list of temperatures."""
+    temps = np.asarray(temps)
+    return pd.DataFrame({"Temperature (K)": temps,
+                         LAMBDA: np.round(conductance(electrolyte, conc, temps), 2)})
+
+
+def daniell_cell(cathode_concs=(0.1, 0.01, 0.001), anode=conc_anode, temp=T):
+    """EMF of the Daniell cell for each CuSO₄ concentration."""
+    cathode = np.asarray(cathode_concs, dtype=float)
+    return pd.DataFrame({"Concentration (M)": cathode,
+                         "[Zn²⁺]/[Cu²⁺]": anode / cathode,
+                         "ln([Zn²⁺]/[Cu²⁺])": ln_ratio(anode, cathode),
+                         "EMF (V)": nernst(anode, cathode, temp)})
+
+
+def random_conductance(n, rng, electrolytes=ELECTROLYTES, conc_range=(0.001, 0.1), temp_range=(298, 338)):
+    """`n` readings at random electrolyte, concentration and temperature."""
+    salts = rng.choice(np.asarray(electrolytes), size=n)
+    conc = rng.uniform(*conc_range, size=n)
+    temps = rng.uniform(*temp_range, size=n)
+    return pd.DataFrame({"Salt": salts, "Concentration (M)": conc,
+                         "Temperature (K)": temps, LAMBDA: conductance(salts, conc, temps)})
+
+
+def random_daniell(n, rng, conc_range=(0.001, 0.1), temp_range=(298, 338), anode=conc_anode):
+    """`n` EMF readings at random CuSO₄ concentration and temperature."""
+    cathode = rng.uniform(*conc_range, size=n)
+    temps = rng.uniform(*temp_range, size=n)
+    return pd.DataFrame({"Concentration (M)": cathode, "Temperature (K)": temps,
+                         "EMF (V)": nernst(anode, cathode, temps)})
+
+
+GENERATORS = {"conductance": random_conductance, "daniell": random_daniell}
+
+
+def iter_chunks(experiment, rows, seed=None, chunk_rows=CHUNK_ROWS):
+    """Yield DataFrames of random readings totalling `rows`, one chunk at a time."""
+    generate = GENERATORS[experiment]
+    rng = np.random.default_rng(seed)
+    done = 0
+    while done < rows:
+        n = min(chunk_rows, rows - done)
+        yield generate(n, rng)
+        done += n
+
+
+def write_frame(df, path):
+    """Write one DataFrame as CSV or Parquet depending on the file extension."""
+    if str(path).endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def stream_to_file(experiment, rows, path, seed=None, chunk_rows=CHUNK_ROWS):
+    """Stream `rows` random readings to CSV or Parquet without holding them all in memory."""
+    chunks = iter_chunks(experiment, rows, seed, chunk_rows)
+    if str(path).endswith(".parquet"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        try:
+            for df in chunks:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            for i, df in enumerate(chunks):
+                df.to_csv(f, index=False, header=(i == 0))
@@ -0,0 +1,173 @@
+"""Columnar, append-only measurement tables for session state.
+
+Each column is a preallocated NumPy array grown by doubling, so `append` is
+amortized O(1) and `to_frame` wraps the filled part of each column without
+rebuilding rows. The Experiment, Plots and Reports tabs all read the same store.
+
+A table can be capped at `max_rows`. When it overflows, the oldest quarter of
+the rows is evicted, or appended to a CSV file first when `spill_path` is set.
+
+Filled rows are never moved in place: eviction and `clear` switch to fresh
+buffers. A `snapshot` (or a `to_frame` view) therefore stays valid while the
+script keeps appending, e.g. for a download encoded in another thread.
+"""
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class MeasurementTable:
+    """Fixed-schema table of readings backed by one NumPy array per column."""
+
+    __slots__ = ("columns", "dtypes", "_data", "_size", "max_rows", "spill_path", "evicted")
+
+    def __init__(self, columns, dtypes, capacity=16, max_rows=None, spill_path=None):
+        self.columns = tuple(columns)
+        self.dtypes = tuple(np.dtype(d) for d in dtypes)
+        if len(self.columns) != len(self.dtypes):
+            raise ValueError("columns and dtypes must have the same length")
+        if max_rows is not None and max_rows < 4:
+            raise ValueError("max_rows must be at least 4")
+        self._data = [np.empty(capacity, dtype=d) for d in self.dtypes]
+        self._size = 0
+        self.max_rows = max_rows
+        self.spill_path = spill_path
+        self.evicted = 0  # rows dropped (or spilled) so far
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return self.index_of(key) is not None
+
+    def _grow(self, needed):
+        capacity = len(self._data[0])
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, 2 * capacity, 16)
+        for i, col in enumerate(self._data):
+            grown = np.empty(new_capacity, dtype=col.dtype)
+            grown[:self._size] = col[:self._size]
+            self._data[i] = grown
+
+    def _evict(self, n):
+        """Drop the oldest `n` rows, spilling them to disk first if configured."""
+        if self.spill_path:
+            header = not os.path.exists(self.spill_path)
+            self._frame(0, n).to_csv(self.spill_path, mode="a", index=False, header=header)
+        kept = self._size - n
+        capacity = len(self._data[0])
+        for i, col in enumerate(self._data):
+            fresh = np.empty(capacity, dtype=col.dtype)
+            fresh[:kept] = col[n:self._size]
+            self._data[i] = fresh
+        self._size = kept
+        self.evicted += n
+
+    def _enforce_cap(self):
+        if self.max_rows is not None and self._size > self.max_rows:
+            self._evict(self._size - self.max_rows * 3 // 4)
+
+    def append(self, *row):
+        """Add one reading; values are given in column order."""
+        if len(row) != len(self.columns):
+            raise ValueError(f"expected {len(self.columns)} values, got {len(row)}")
+        self._grow(self._size + 1)
+        for col, value in zip(self._data, row):
+            col[self._size] = value
+        self._size += 1
+        self._enforce_cap()
+
+    def extend(self, *columns):
+        """Add many readings at once from equal-length column arrays."""
+        n = len(columns[0])
+        self._grow(self._size + n)
+        for col, values in zip(self._data, columns):
+            col[self._size:self._size + n] = values
+        self._size += n
+        self._enforce_cap()
+
+    def index_of(self, key):
+        """Row index whose first column equals `key`, or None."""
+        hits = np.flatnonzero(self._data[0][:self._size] == key)
+        return int(hits[0]) if len(hits) else None
+
+    def upsert(self, *row):
+        """Overwrite the row keyed by the first value, or append it."""
+        i = self.index_of(row[0])
+        if i is None:
+            self.append(*row)
+            return
+        for col, value in zip(self._data, row):
+            col[i] = value
+
+    def row(self, key):
+        """Values of the row keyed by `key` (KeyError if missing)."""
+        i = self.index_of(key)
+        if i is None:
+            raise KeyError(key)
+        return tuple(col[i].item() if col.dtype != object else col[i] for col in self._data)
+
+    def column(self, name):
+        """Read-only view of the filled part of a column."""
+        view = self._data[self.columns.index(name)][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def clear(self):
+        self._data = [np.empty(len(col), dtype=col.dtype) for col in self._data]
+        self._size = 0
+        self.evicted = 0
+        if self.spill_path and os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+
+    def snapshot(self):
+        """Read-only table over the rows filled so far, sharing their buffers (O(1))."""
+        snap = MeasurementTable.__new__(MeasurementTable)
+        snap.columns, snap.dtypes = self.columns, self.dtypes
+        snap._data = [col[:self._size] for col in self._data]
+        snap._size = self._size
+        snap.max_rows, snap.spill_path, snap.evicted = None, None, self.evicted
+        return snap
+
+    @property
+    def nbytes(self):
+        """Memory held by the column buffers (object columns count pointers only)."""
+        return sum(col.nbytes for col in self._data)
+
+    def _frame(self, start, stop):
+        return pd.DataFrame({name: col[start:stop] for name, col in zip(self.columns, self._data)},
+                            copy=False)
+
+    def to_frame(self):
+        """DataFrame over the column views (no row-by-row rebuild)."""
+        return pd.DataFrame({name: self.column(name) for name in self.columns}, copy=False)
+
+    def iter_frames(self, chunk_rows):
+        """DataFrames over consecutive slices of at most `chunk_rows` rows."""
+        for start in range(0, self._size, chunk_rows):
+            yield self._frame(start, min(start + chunk_rows, self._size))
+
+    def to_arrow(self):
+        """pyarrow Table over the columns; numeric columns are zero-copy."""
+        import pyarrow as pa
+
+        return pa.table({name: self.column(name) for name in self.columns})
+
+    def fingerprint(self):
+        """Content hash, equal for tables holding the same readings."""
+        parts = []
+        for col in self._data:
+            filled = col[:self._size]
+            parts.append(hash(tuple(filled)) if col.dtype == object else hash(filled.tobytes()))
+        return hash((self.columns, self._size, self.evicted, *parts))
+
+    def digest(self):
+        """64-bit content digest that, unlike `fingerprint`, is the same in every process."""
+        h = hashlib.blake2b(repr((self.columns, self._size, self.evicted)).encode("utf-8"), digest_size=8)
+        for col in self._data:
+            filled = col[:self._size]
+            h.update(repr(filled.tolist()).encode("utf-8") if col.dtype == object else filled.tobytes())
+        return int.from_bytes(h.digest(), "little")
@@ -0,0 +1,83 @@
+"""Parameter sweeps over process pools.
+
+A sweep flattens its grid, splits it into chunks of `chunk_size` points and
+evaluates the chunks on a `concurrent.futures.ProcessPoolExecutor`. The chunk
+results are merged back, in grid order, into a single columnar DataFrame.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from chemlab.conductance import conductance
+from chemlab.nernst import conc_anode, nernst
+
+CHUNK_SIZE = 200_000
+
+
+def _conductance_chunk(electrolytes, concs, temps, start, stop):
+    i, j, k = np.unravel_index(np.arange(start, stop), (len(electrolytes), len(concs), len(temps)))
+    salts, c, t = electrolytes[i], concs[j], temps[k]
+    return {"Salt": salts, "Concentration (M)": c, "Temperature (K)": t,
+            "Conductance Λ (S·cm²·mol⁻¹)": conductance(salts, c, t)}
+
+
+def _daniell_chunk(ratios, temps, anode, start, stop):
+    i, k = np.unravel_index(np.arange(start, stop), (len(ratios), len(temps)))
+    r, t = ratios[i], temps[k]
+    cathode = anode / r
+    return {"[Zn²⁺]/[Cu²⁺]": r, "Concentration (M)": cathode, "Temperature (K)": t,
+            "EMF (V)": nernst(anode, cathode, t)}
+
+
+def run_chunks(func, args, total, workers=None, chunk_size=CHUNK_SIZE, progress=None):
+    """Evaluate `func(*args, start, stop)` over [0, total) and merge the chunks.
+
+    `progress(done, total)` is called after each chunk finishes. With
+    `workers=1`, or when the grid fits in one chunk, no pool is started.
+    """
+    bounds = [(s, min(s + chunk_size, total)) for s in range(0, total, chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    parts = [None] * len(bounds)
+    done = 0
+
+    if workers == 1 or len(bounds) <= 1:
+        for n, (start, stop) in enumerate(bounds):
+            parts[n] = func(*args, start, stop)
+            done += stop - start
+            if progress:
+                progress(done, total)
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+            futures = {pool.submit(func, *args, start, stop): n for n, (start, stop) in enumerate(bounds)}
+            for fut in as_completed(futures):
+                n = futures[fut]
+                parts[n] = fut.result()
+                start, stop = bounds[n]
+                done += stop - start
+                if progress:
+                    progress(done, total)
+
+    if not parts:
+        return pd.DataFrame()
+    return pd.DataFrame({col: np.concatenate([p[col] for p in parts]) for col in parts[0]})
+
+
+def conductance_sweep(electrolytes, concs, temps, workers=None, chunk_size=CHUNK_SIZE, progress=None):
+    """Λ over every electrolyte x concentration x temperature combination."""
+    electrolytes = np.asarray(electrolytes)
+    concs = np.asarray(concs, dtype=float)
+    temps = np.asarray(temps, dtype=float)
+    total = len(electrolytes) * len(concs) * len(temps)
+    return run_chunks(_conductance_chunk, (electrolytes, concs, temps), total,
+                      workers, chunk_size, progress)
+
+
+def daniell_sweep(ratios, temps, anode=conc_anode, workers=None, chunk_size=CHUNK_SIZE, progress=None):
+    """Daniell-cell EMF over every [Zn²⁺]/[Cu²⁺] ratio x temperature combination."""
+    ratios = np.asarray(ratios, dtype=float)
+    temps = np.asarray(temps, dtype=float)
+    total = len(ratios) * len(temps)
+    return run_chunks(_daniell_chunk, (ratios, temps, anode), total,
+                      workers, chunk_size, progress)
@@ -0,0 +1,234 @@
+"""Small Streamlit helpers shared by the pages."""
+import functools
+import os
+import random
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from chemlab import activity, export, history, profiling, workers
+from chemlab.noise import make_rng
+from chemlab.store import MeasurementTable
+
+
+def flash(key, msg):
+    """Store a success message and rerun the whole app so every tab sees new data.
+
+    Used from inside fragments: a fragment-scoped rerun would leave the Plots
+    and Reports tabs stale after a measurement.
+    """
+    st.session_state[key] = msg
+    st.rerun(scope="app")
+
+
+def show_flash(key):
+    """Show (once) the message stored by `flash`."""
+    msg = st.session_state.pop(key, None)
+    if msg:
+        st.success(msg)
+
+
+def noise_controls():
+    """Sidebar controls for the Monte-Carlo noise mode.
+
+    Returns None when the mode is off, else (replicates, seed, rng). The
+    session's generator is rebuilt only when the seed changes, so its stream
+    of readings is reproducible.
+    """
+    if not st.sidebar.checkbox("Instrument noise", value=False, key="noise_on"):
+        return None
+    if "noise_default_seed" not in st.session_state:
+        st.session_state.noise_default_seed = random.randrange(2**31)
+    n = int(st.sidebar.number_input("Replicates per reading", min_value=1, max_value=100_000,
+                                    value=100, key="noise_n"))
+    seed = int(st.sidebar.number_input("Noise seed", min_value=0, max_value=2**31 - 1,
+                                       value=st.session_state.noise_default_seed, key="noise_seed"))
+    if st.session_state.get("noise_rng_seed") != seed:
+        st.session_state.noise_rng = make_rng(seed)
+        st.session_state.noise_rng_seed = seed
+    return n, seed, st.session_state.noise_rng
+
+
+def nonideal_controls(cell=False):
+    """Sidebar controls for the non-ideal solution mode.
+
+    Returns None when the mode is off, else the law to measure with:
+    `activity.conductance`, or with `cell` an `activity.nernst` bound to the
+    chosen activity model and added KNO₃.
+    """
+    if not st.sidebar.checkbox("Non-ideal solutions", value=False, key="nonideal_on",
+                               help="Activity coefficients and temperature-dependent Onsager terms"):
+        return None
+    if not cell:
+        return activity.conductance
+    method = st.sidebar.selectbox("Activity model", activity.METHODS, key="nonideal_method",
+                                  format_func={"davies": "Davies",
+                                               "debye-huckel": "Extended Debye–Hückel"}.get)
+    kno3 = st.sidebar.number_input("Added KNO₃ (M)", min_value=0.0, max_value=1.5, value=0.0,
+                                   step=0.05, key="nonideal_kno3")
+    return functools.partial(activity.nernst, kno3=float(kno3), method=method)
+
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else "local"
+
+
+def new_table(name, columns, dtypes, **kwargs):
+    """MeasurementTable for this session, capped (and spilled) in server mode."""
+    spill = workers.spill_dir()
+    if spill:
+        os.makedirs(spill, exist_ok=True)
+        kwargs.setdefault("spill_path", os.path.join(spill, f"{_session_id()}-{name}.csv"))
+    return MeasurementTable(columns, dtypes, max_rows=workers.max_rows(), **kwargs)
+
+
+def server_metrics(*tables):
+    """Report this session's history size and, in server mode, show pool/memory metrics."""
+    workers.session_memory.update(_session_id(), sum(t.nbytes for t in tables),
+                                  sum(len(t) for t in tables))
+    if not workers.server_mode():
+        return
+    m = workers.metrics()
+    with st.sidebar.expander("Server metrics"):
+        st.caption(f"Queue depth: {m.get('queue_depth', 0)}/{m.get('queue_size', '-')} · "
+                   f"workers: {m.get('workers', '-')} · rejected: {m.get('rejected', 0)}")
+        st.caption(f"Sessions: {m['sessions']} · history memory: {m['total_bytes'] / 1024:.1f} KiB "
+                   f"(largest session {m['max_session_bytes'] / 1024:.1f} KiB)")
+        evicted = sum(t.evicted for t in tables)
+        if evicted:
+            st.caption(f"{evicted} older readings evicted from this session's history")
+
+
+_FORMAT_LABELS = {"csv": "CSV", "parquet": "Parquet", "zip": "ZIP", "xlsx": "Excel"}
+
+
+def download_buttons(label, tables, stem, formats=("csv", "parquet")):
+    """One download button per format; the file is encoded only when clicked.
+
+    `tables` may also be a zero-argument callable returning the dict, so
+    derived tables are not even built until a download is requested.
+    Measurement tables are snapshotted at render time. In server mode the
+    files are instead encoded up front on the shared worker pool
+    (`workers.run`, cached by content in `export`): an error raised inside
+    Streamlit's click callback only breaks the download, whereas here a full
+    queue shows the same "server busy" warning as the plots.
+    """
+    if not callable(tables):
+        tables = {name: t.snapshot() if isinstance(t, MeasurementTable) else t
+                  for name, t in tables.items()}
+    formats = [f for f in formats if export.available(f)]
+    if workers.server_mode():
+        try:
+            frames = tables() if callable(tables) else tables
+            data = {fmt: workers.run(export.encode, fmt, frames) for fmt in formats}
+        except workers.ServerBusy:
+            st.warning("The server is busy; the downloads will be ready on the next interaction.")
+            return
+    else:
+        data = {fmt: lambda fmt=fmt: export.encode(fmt, tables() if callable(tables) else tables)
+                for fmt in formats}
+    for col, fmt in zip(st.columns(len(formats)), formats):
+        col.download_button(f"Download {label} {_FORMAT_LABELS[fmt]}", data[fmt],
+                            f"{stem}.{export.FORMATS[fmt][0]}", export.FORMATS[fmt][1],
+                            key=f"download_{stem}_{fmt}", on_click="ignore")
+
+
+def profiler_toggle():
+    """Sidebar switch for per-rerun profiling (on by default with CHEMLAB_PROFILE=1).
+
+    When on, starts a profile of this script run; `profiler_panel` at the end
+    of the page stops it and shows the breakdown.
+    """
+    on = st.sidebar.toggle("Profile reruns", value=profiling.env_enabled(), key="profile_on")
+    if on:
+        snapshots = st.sidebar.checkbox("Top allocation sites", value=False, key="profile_snapshots")
+        profiling.start(snapshots=snapshots)
+    return on
+
+
+def profiler_panel():
+    """Per-block timing/memory table for this rerun plus folded-stack and trace downloads."""
+    profile = profiling.stop()
+    if profile is None:
+        return
+    rows = profile.rows()
+    frame = pd.DataFrame({
+        "Block": ["· " * (len(path) - 1) + path[-1] for path, *_ in rows],
+        "Time (ms)": [t * 1e3 for _, t, _, _, _ in rows],
+        "Self (ms)": [s * 1e3 for _, _, s, _, _ in rows],
+        "% of rerun": [100 * t / profile.total for _, t, _, _, _ in rows],
+        "Allocated (KiB)": [a / 1024 for *_, a, _ in rows],
+        "Peak (KiB)": [p / 1024 for *_, p in rows],
+    })
+    with st.sidebar.expander(f"Profile: {profile.total * 1e3:.0f} ms", expanded=True):
+        st.dataframe(frame.round(2), hide_index=True)
+        if profile.top_allocations:
+            st.dataframe(pd.DataFrame(profile.top_allocations,
+                                      columns=["Line", "Size diff (B)", "Count diff"]),
+                         hide_index=True)
+        st.download_button("Folded stacks", profile.folded(), "profile.folded", "text/plain",
+                           key="profile_folded", on_click="ignore")
+        st.download_button("Chrome trace", profile.chrome_trace(), "profile.trace.json",
+                           "application/json", key="profile_trace", on_click="ignore")
+
+
+def run_id():
+    """Identifier of this lab run, kept in the URL (?run=...) so a bookmark resumes it."""
+    if "run_id" not in st.session_state:
+        st.session_state.run_id = st.query_params.get("run") or uuid.uuid4().hex[:12]
+    if st.query_params.get("run") != st.session_state.run_id:
+        st.query_params["run"] = st.session_state.run_id
+    return st.session_state.run_id
+
+
+def history_enabled():
+    return history.get() is not None
+
+
+def history_status():
+    """Sidebar note with the run id when persistence (CHEMLAB_DB) is on."""
+    if history.get() is not None:
+        st.sidebar.caption(f"Lab run `{run_id()}` is saved; bookmark this page's URL to resume it.")
+
+
+def persist(experiment, value, **fields):
+    """Record one reading in the persistent history, if enabled."""
+    hist = history.get()
+    if hist is not None:
+        hist.record(run_id(), experiment, value, **fields)
+
+
+def restore(experiment, latest_per_label=False):
+    """This run's saved readings for `experiment` as a DataFrame, or None."""
+    hist = history.get()
+    if hist is None:
+        return None
+    df = hist.run(run_id(), experiment, latest_per_label)
+    return df if len(df) else None
+
+
+def forget(*experiments):
+    """Drop this run's saved readings when its tables are reset."""
+    hist = history.get()
+    if hist is not None:
+        hist.clear(run_id(), experiments)
+
+
+def cohort_table(title, experiment, by, group_label, value_label):
+    """Aggregates over all saved runs for one experiment (nothing when persistence is off)."""
+    hist = history.get()
+    if hist is None:
+        return
+    st.markdown(f"**{title}**")
+    df = hist.cohort(experiment, by)
+    if not len(df):
+        st.caption("No saved runs yet.")
+        return
+    st.dataframe(df.rename(columns={"group": group_label, "mean": f"Mean {value_label}",
+                                    "sd": "SD", "min": "Min", "max": "Max",
+                                    "runs": "Runs", "readings": "Readings"}).round(4),
+                 hide_index=True)
@@ -0,0 +1,165 @@
+"""Shared compute workers and per-session memory accounting for server mode.
+
+Server mode is switched on with the CHEMLAB_SERVER_MODE environment variable.
+In that mode, heavy work (fits, figure builds, exports) is sent through `run`
+to one process-wide pool instead of running inline in each session's script
+thread. The pool has a bounded queue. When it is full, `run` waits up to
+`timeout` seconds for a slot and then raises `ServerBusy`, so a burst of
+sessions cannot pile up unbounded work.
+
+Outside server mode, `run` simply calls the function.
+
+Configuration (environment variables):
+
+- CHEMLAB_SERVER_MODE   "1" to enable
+- CHEMLAB_WORKERS       pool size (default: CPU count)
+- CHEMLAB_WORKER_KIND   "thread" (default) or "process"
+- CHEMLAB_QUEUE_SIZE    max submitted-but-unfinished tasks (default: 4 x workers)
+- CHEMLAB_MAX_ROWS      per-table row cap for session history (default 10000)
+- CHEMLAB_SPILL_DIR     if set, evicted rows are appended to CSV files here
+"""
+import glob
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+class ServerBusy(RuntimeError):
+    """The shared worker queue stayed full for longer than the timeout."""
+
+
+def server_mode():
+    return os.environ.get("CHEMLAB_SERVER_MODE", "").lower() in ("1", "true", "yes", "on")
+
+
+def max_rows():
+    """Per-table history cap in server mode, else None (unbounded)."""
+    if not server_mode():
+        return None
+    return int(os.environ.get("CHEMLAB_MAX_ROWS", 10_000))
+
+
+def spill_dir():
+    return os.environ.get("CHEMLAB_SPILL_DIR") or None
+
+
+class WorkerPool:
+    """Executor with a bounded number of queued + running tasks and basic metrics."""
+
+    def __init__(self, workers=None, kind="thread", queue_size=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.kind = kind
+        self.queue_size = queue_size or 4 * self.workers
+        executor = ProcessPoolExecutor if kind == "process" else ThreadPoolExecutor
+        self._executor = executor(max_workers=self.workers)
+        self._slots = threading.BoundedSemaphore(self.queue_size)
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._latency_seconds = 0.0
+
+    def _done(self, fut, started):
+        self._slots.release()
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+            self._latency_seconds += time.perf_counter() - started
+
+    def submit(self, fn, *args, timeout=None, **kwargs):
+        """Queue `fn(*args, **kwargs)`; raise ServerBusy if no slot frees up within `timeout`."""
+        if not self._slots.acquire(timeout=timeout):
+            with self._lock:
+                self._rejected += 1
+            raise ServerBusy(f"worker queue full ({self.queue_size} tasks)")
+        with self._lock:
+            self._pending += 1
+        started = time.perf_counter()
+        try:
+            fut = self._executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            with self._lock:
+                self._pending -= 1
+            raise
+        fut.add_done_callback(lambda f: self._done(f, started))
+        return fut
+
+    def metrics(self):
+        with self._lock:
+            return {"workers": self.workers, "kind": self.kind, "queue_size": self.queue_size,
+                    "queue_depth": self._pending, "completed": self._completed,
+                    "rejected": self._rejected, "latency_seconds": round(self._latency_seconds, 3)}
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The process-wide pool, created on first use from the environment."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = int(os.environ.get("CHEMLAB_WORKERS", 0)) or None
+            queue_size = int(os.environ.get("CHEMLAB_QUEUE_SIZE", 0)) or None
+            _pool = WorkerPool(workers, os.environ.get("CHEMLAB_WORKER_KIND", "thread"), queue_size)
+        return _pool
+
+
+def run(fn, *args, timeout=30, **kwargs):
+    """Call `fn` on the shared pool in server mode (waiting for its result), else inline."""
+    if not server_mode():
+        return fn(*args, **kwargs)
+    return get_pool().submit(fn, *args, timeout=timeout, **kwargs).result()
+
+
+class SessionMemory:
+    """Latest measurement-history size reported by each live session."""
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def update(self, session_id, nbytes, rows):
+        now = time.time()
+        with self._lock:
+            self._sessions[session_id] = (nbytes, rows, now)
+            stale = [s for s, (_, _, seen) in self._sessions.items() if now - seen > self.ttl]
+        for s in stale:
+            self.forget(s)
+
+    def forget(self, session_id):
+        """Drop `session_id` and delete the history it spilled to disk."""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+        spill = spill_dir()
+        if spill:
+            for path in glob.glob(os.path.join(glob.escape(spill), f"{glob.escape(session_id)}-*.csv")):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def metrics(self):
+        with self._lock:
+            sizes = [b for b, _, _ in self._sessions.values()]
+            rows = [r for _, r, _ in self._sessions.values()]
+        return {"sessions": len(sizes), "total_bytes": sum(sizes),
+                "max_session_bytes": max(sizes, default=0), "max_session_rows": max(rows, default=0)}
+
+
+session_memory = SessionMemory()
+
+
+def metrics():
+    """Queue and memory metrics for the whole process."""
+    out = {"server_mode": server_mode(), **session_memory.metrics()}
+    if _pool is not None:
+        out.update(_pool.metrics())
+    return out
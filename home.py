@@ -1,8 +1,11 @@
 import streamlit as st
-from streamlit_lottie import st_lottie
-import json
 import os
 
+from chemlab.assets import load_json
+from chemlab.lazy import lazy_import
+
+streamlit_lottie = lazy_import("streamlit_lottie")
+
 st.set_page_config(page_title="ChemLabSimulator", layout="wide", page_icon="🧪")
 
 st.title("🧪 Welcome to ChemLabSimulator")
@@ -47,13 +50,12 @@ st.markdown("---")
 file_path = "images/Laboratory.json"
 
 if os.path.exists(file_path):
-    with open(file_path, "r", encoding="utf-8") as f:
-        try:
-            animation = json.load(f)
-            st_lottie(animation, speed=1, height=400, key="chemistry")
-        except Exception as e:
-            st.error(f"Error loading animation: {e}")
-            st.info("🧪 Chemistry animation would be displayed here.")
+    try:
+        animation = load_json(file_path)
+        streamlit_lottie.st_lottie(animation, speed=1, height=400, key="chemistry")
+    except Exception as e:
+        st.error(f"Error loading animation: {e}")
+        st.info("🧪 Chemistry animation would be displayed here.")
 else:
     st.error(f"Animation file not found: {file_path}")
     st.info("🧪 Chemistry animation would be displayed here.")
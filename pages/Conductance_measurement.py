@@ -1,12 +1,18 @@
-import streamlit as st
-import matplotlib.pyplot as plt
-import math
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 import numpy as np
-import streamlit.components.v1 as components
-import io
+import streamlit as st
+
+from chemlab.assets import conductance_theory_tables
+from chemlab import electrolytes
+from chemlab.conductance import ELECTROLYTES, T0, conductance
+from chemlab.figures import describe, dilution_figure, temperature_figure, titration_figure
+from chemlab.noise import CONDUCTIVITY_METER, conductance_readings, make_rng, stream_id, summarize
+from chemlab.profiling import profiled, span
+from chemlab.regression import OnlineFit
+from chemlab.titration import ACIDS, BASES, cached_curve, equivalence_point
+from chemlab.ui import (cohort_table, download_buttons, flash, forget, history_enabled, history_status,
+                        new_table, noise_controls, nonideal_controls, persist, profiler_panel, profiler_toggle,
+                        restore, server_metrics, show_flash)
+from chemlab.workers import ServerBusy, run
 
 st.set_page_config(page_title="Conductance Measurement Simulator", layout="wide")
 st.title("🔬 Conductance Measurement Simulator")
@@ -16,13 +22,50 @@ st.write("Interactive virtual lab for studying electrolyte conductance")
 st.sidebar.header("Simulator Controls")
 template_choice = st.sidebar.selectbox("Layout template", ["Default", "Compact"], index=0)
 show_help = st.sidebar.checkbox("Show help panels", value=True)
-
-tabs = st.tabs(["Theory","Experiments","Plots","Reports"])
+profiler_toggle()
+noise = noise_controls()
+law = nonideal_controls() or conductance
+history_status()
+
+# session states (restored from the saved run when CHEMLAB_DB is set)
+if 'table1' not in st.session_state:
+    st.session_state.table1 = new_table("table1",
+        ["Salt","Conductance Λ (S·cm²·mol⁻¹)","Temperature (K)"], [object, float, int])
+    saved = restore("standards")
+    if saved is not None:
+        st.session_state.table1.extend(saved["label"].to_numpy(object), saved["value"], saved["temperature"])
+if 'table2' not in st.session_state:
+    st.session_state.table2 = new_table("table2",
+        ["Volume (mL)","Concentration (M)","Conductance Λ (S·cm²·mol⁻¹)","Temperature (K)"],
+        [int, float, float, int])
+    st.session_state.fit2 = OnlineFit()
+    st.session_state.current_volume = 20
+    st.session_state.initial_moles = 0.1 * 0.02
+    saved = restore("dilution")
+    if saved is not None:
+        st.session_state.table2.extend(saved["volume"], saved["concentration"], saved["value"], saved["temperature"])
+        st.session_state.fit2 = OnlineFit.from_arrays(saved["concentration"], saved["value"])
+        st.session_state.current_volume = int(saved["volume"].iloc[-1])
+if 'temp_table' not in st.session_state:
+    st.session_state.temp_table = new_table("temp_table",
+        ["Temperature (K)","Conductance Λ (S·cm²·mol⁻¹)"], [int, float])
+    st.session_state.fit_temp = OnlineFit()
+    saved = restore("temperature")
+    if saved is not None:
+        st.session_state.temp_table.extend(saved["temperature"], saved["value"])
+        st.session_state.fit_temp = OnlineFit.from_arrays(saved["temperature"], saved["value"])
+server_metrics(st.session_state.table1, st.session_state.table2, st.session_state.temp_table)
+
+# Each tab and each experiment block is a fragment, so a widget inside it only
+# reruns that block. Actions that change measured data rerun the whole app via
+# `flash` so the Plots and Reports tabs stay in sync.
 
 # ---------------------------------------------------------------------
 # THEORY TAB
 # ---------------------------------------------------------------------
-with tabs[0]:
+@st.fragment
+@profiled("Theory")
+def theory_tab(template_choice, show_help):
     st.header("Theory")
     
     if template_choice == "Compact":
@@ -48,27 +91,18 @@ with tabs[0]:
     Conductance measurement is used for purity checks and determination of constants.
     """)
 
+    with span("theory tables"):
+        theory = conductance_theory_tables()
+
     st.subheader("Equivalent Conductivity at Infinite Dilution (25°C)")
-    cations = pd.DataFrame({
-        "Cation": ["H⁺", "K⁺", "Na⁺", "Ag⁺", "NH₄⁺", "Li⁺", "Ca²⁺", "Mg²⁺", "Zn²⁺"],
-        "Λ (S·cm²·mol⁻¹)": [350.0, 73.5, 50.1, 59.5, 73.5, 38.7, 76.4, 53.0, 50.1]
-    })
     st.write("**Cations**")
-    st.table(cations)
+    st.table(theory["cations"])
 
-    anions = pd.DataFrame({
-        "Anion": ["OH⁻", "Cl⁻", "Br⁻", "I⁻", "NO₃⁻", "ClO₃⁻", "CH₃COO⁻", "SO₄²⁻", "HSO₄⁻"],
-        "Λ (S·cm²·mol⁻¹)": [198.0, 76.3, 78.4, 76.8, 71.4, 80.0, 40.9, 69.3, 55.4]
-    })
     st.write("**Anions**")
-    st.table(anions)
+    st.table(theory["anions"])
 
-    salts = pd.DataFrame({
-        "Salt": ["HF", "HCl", "HBr", "HI", "KOH", "NaOH", "KCl", "NaCl"],
-        "Λ (S·cm²·mol⁻¹)": [405.1, 426.1, 427.7, 426.4, 271.5, 247.7, 150.0, 145.0]
-    })
     st.write("**Salts**")
-    st.table(salts)
+    st.table(theory["salts"])
 
     if show_help:
         st.subheader("MATERIALS REQUIRED")
@@ -86,22 +120,9 @@ with tabs[0]:
         """)
 
     st.subheader("Observation Tables (Blank)")
-    table1 = pd.DataFrame({
-        "S.No": [1,2,3],
-        "Solution": ["0.1M HCl","0.1M NaCl","0.1M KCl"],
-        "Conductance Λ (S·cm²·mol⁻¹)": ["","",""],
-        "Temperature (K)": ["","",""]
-    })
-    st.table(table1)
-
-    table2 = pd.DataFrame({
-        "S.No": [1,2,3,4,5,6],
-        "Volume (mL)": ["20","24","28","32","36","40"],
-        "Concentration (M)": ["0.1000","0.0833","0.0714","0.0625","0.0556","0.0500"],
-        "Conductance Λ (S·cm²·mol⁻¹)": ["","","","","",""],
-        "Temperature (K)": ["","","","","",""]
-    })
-    st.table(table2)
+    st.table(theory["table1"])
+
+    st.table(theory["table2"])
 
     if template_choice == "Compact":
         st.markdown('</div>', unsafe_allow_html=True)
@@ -110,43 +131,42 @@ with tabs[0]:
 # ---------------------------------------------------------------------
 # EXPERIMENT TAB
 # ---------------------------------------------------------------------
-with tabs[1]:
-    st.header("Experiment")
-
-    # session states
-    if 'table1' not in st.session_state:
-        st.session_state.table1 = []
-    if 'table2' not in st.session_state:
-        st.session_state.table2 = []
-        st.session_state.current_volume = 20
-        st.session_state.initial_moles = 0.1 * 0.02
-    if 'temp_table' not in st.session_state:
-        st.session_state.temp_table = []
-
-    # constants
-    Λ0 = {"HCl": 426.1, "NaCl": 145.0, "KCl": 150.0}
-    k_const = {"HCl": 200, "NaCl": 120, "KCl": 140}
-    T0 = 298
-    alpha = 0.015  # K^-1 more realistic
-
+def measure(electrolyte, C, T, noise, law):
+    """Λ reading and a message suffix; in noise mode the mean of n replicate readings."""
+    if not noise:
+        return round(float(law(electrolyte, C, T)),2), ""
+    n, _, rng = noise
+    mean, sd, _, _ = summarize(conductance_readings(rng, electrolyte, C, T, n, law=law))
+    return round(float(mean),2), f" (σ = {float(sd):.2f}, n = {n})"
+
+@st.fragment
+@profiled("Experiment A")
+def experiment_a(noise, law):
     st.subheader("A) Conductance of 0.1M Electrolytes")
-    salt = st.selectbox("Select electrolyte", ["HCl","NaCl","KCl"])
+    db = electrolytes.load()
+    options = list(ELECTROLYTES) + [s for s in db.lab_salts if s not in ELECTROLYTES]
+    salt = st.selectbox("Select electrolyte", options, format_func=db.display_name)
     if st.button("Measure Conductance (0.1M)"):
         C = 0.1
-        Λ_val = Λ0[salt] - k_const[salt] * math.sqrt(C)
-        Λ_val = round(Λ_val,2)
-        st.session_state.table1.append((salt, Λ_val, T0))
-        st.success(f"Measured Λ = {Λ_val} S·cm²·mol⁻¹ at {T0}K")
+        Λ_val, spread = measure(salt, C, T0, noise, law)
+        st.session_state.table1.append(salt, Λ_val, T0)
+        persist("standards", Λ_val, label=salt, concentration=C, temperature=T0)
+        flash("flash_a", f"Measured Λ = {Λ_val} S·cm²·mol⁻¹ at {T0}K{spread}")
+    show_flash("flash_a")
 
-    df1 = pd.DataFrame(st.session_state.table1, columns=["Salt","Conductance Λ (S·cm²·mol⁻¹)","Temperature (K)"])
-    st.table(df1)
-    st.download_button("Download Table 1 CSV", df1.to_csv(index=False), "table1.csv")
+    st.table(st.session_state.table1.to_frame())
+    download_buttons("Table 1", {"table1": st.session_state.table1}, "table1")
 
     if st.button("Reset Table 1 Data"):
-        st.session_state.table1 = []
+        st.session_state.table1.clear()
+        forget("standards")
+        st.rerun(scope="app")
 
+@st.fragment
+@profiled("Experiment B")
+def experiment_b(noise, law):
     st.subheader("B) Serial Dilution of NaCl")
-    st.write(f"Current Volume = {st.session_state.current_volume} mL")
+    volume_slot = st.empty()
 
     colD1, colD2 = st.columns(2)
     with colD1:
@@ -160,117 +180,150 @@ with tabs[1]:
         if st.button("Measure Conductance (Diluted)"):
             V = st.session_state.current_volume/1000
             C = st.session_state.initial_moles / V
-            Λ_val = Λ0["NaCl"] - k_const["NaCl"]*math.sqrt(C)
-            Λ_val = round(Λ_val,2)
-            st.session_state.table2.append((st.session_state.current_volume, round(C,4), Λ_val, T0))
-            st.success(f"Measured Λ = {Λ_val} S·cm²·mol⁻¹ at {T0}K")
-
-    df2 = pd.DataFrame(st.session_state.table2,
-                       columns=["Volume (mL)","Concentration (M)","Conductance Λ (S·cm²·mol⁻¹)","Temperature (K)"])
-    st.table(df2)
-    st.download_button("Download Table 2 CSV", df2.to_csv(index=False), "dilution.csv")
+            Λ_val, spread = measure("NaCl", C, T0, noise, law)
+            st.session_state.table2.append(st.session_state.current_volume, round(C,4), Λ_val, T0)
+            st.session_state.fit2.add(round(C,4), Λ_val)
+            persist("dilution", Λ_val, volume=st.session_state.current_volume, concentration=round(C,4),
+                    temperature=T0)
+            flash("flash_b", f"Measured Λ = {Λ_val} S·cm²·mol⁻¹ at {T0}K{spread}")
+    volume_slot.write(f"Current Volume = {st.session_state.current_volume} mL")
+    show_flash("flash_b")
+
+    st.table(st.session_state.table2.to_frame())
+    download_buttons("Table 2", {"dilution": st.session_state.table2}, "dilution")
 
     if st.button("Reset Dilution Data"):
-        st.session_state.table2 = []
+        st.session_state.table2.clear()
+        st.session_state.fit2.clear()
         st.session_state.current_volume = 20
+        forget("dilution")
+        st.rerun(scope="app")
 
+@st.fragment
+@profiled("Experiment C")
+def experiment_c(noise, law):
     st.subheader("C) Temperature Effect on KCl (0.1M)")
     T = st.slider("Temperature (K)", min_value=298, max_value=338, value=298)
     if st.button("Measure Conductance (Temp)"):
         C = 0.1
-        Λ25 = Λ0["KCl"] - k_const["KCl"]*math.sqrt(C)
-        ΛT = Λ25 * (1 + alpha*(T-T0))
-        ΛT = round(ΛT,2)
-        st.session_state.temp_table.append((T,ΛT))
-        st.success(f"Measured Λ = {ΛT} S·cm²·mol⁻¹ at {T}K")
+        ΛT, spread = measure("KCl", C, T, noise, law)
+        st.session_state.temp_table.append(T,ΛT)
+        st.session_state.fit_temp.add(T, ΛT)
+        persist("temperature", ΛT, label="KCl", concentration=C, temperature=T)
+        flash("flash_c", f"Measured Λ = {ΛT} S·cm²·mol⁻¹ at {T}K{spread}")
+    show_flash("flash_c")
 
-    dfT = pd.DataFrame(st.session_state.temp_table, columns=["Temperature (K)","Conductance Λ (S·cm²·mol⁻¹)"])
-    st.table(dfT)
-    st.download_button("Download Temp CSV", dfT.to_csv(index=False), "temp.csv")
+    st.table(st.session_state.temp_table.to_frame())
+    download_buttons("Temp", {"temp": st.session_state.temp_table}, "temp")
 
     if st.button("Reset Temperature Data"):
-        st.session_state.temp_table = []
+        st.session_state.temp_table.clear()
+        st.session_state.fit_temp.clear()
+        forget("temperature")
+        st.rerun(scope="app")
+
+ACID_VOLUME = 25.0  # mL in the beaker
+
+@st.fragment
+@profiled("Experiment D")
+def experiment_d(noise):
+    st.subheader("D) Conductometric Titration")
+    c1, c2, c3, c4 = st.columns(4)
+    acid = c1.selectbox("Acid (25 mL)", list(ACIDS), key="titr_acid")
+    base = c2.selectbox("Titrant", list(BASES), key="titr_base")
+    acid_conc = c3.number_input("Acid concentration (M)", min_value=0.001, max_value=1.0, value=0.1,
+                                step=0.01, format="%.3f", key="titr_acid_conc")
+    base_conc = c4.number_input("Titrant concentration (M)", min_value=0.01, max_value=1.0, value=0.1,
+                                step=0.01, format="%.3f", key="titr_base_conc")
+
+    curve = cached_curve(acid, base, acid_conc, ACID_VOLUME, base_conc)
+    volume = curve["volume"]
+    v_max = float(volume[-1])
+    added = st.slider("Burette reading (mL)", min_value=0.0, max_value=round(v_max, 2),
+                      value=round(v_max, 2), step=0.05, key="titr_added")
+    k = max(int(np.searchsorted(volume, added, side="right")), 1)
+
+    kappa = curve["corrected"]
+    seed = None
+    if noise:
+        seed = noise[1]
+        # one stream per curve, independent of the burette reading, so points keep their noise
+        rng = make_rng(seed, stream_id(acid, base, acid_conc, base_conc))
+        kappa = CONDUCTIVITY_METER.apply(rng, kappa)
+    fit = equivalence_point(volume[:k], kappa[:k])
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("pH", f"{curve['ph'][k - 1]:.2f}")
+    m2.metric("Corrected κ (mS/cm)", f"{kappa[k - 1]:.3f}")
+    m3.metric("Equivalence (fit)", f"{fit[0]:.2f} mL" if fit else "—")
+
+    key = (acid, base, acid_conc, base_conc, k, seed)
+    try:
+        fig, stats = run(titration_figure, volume[:k], kappa[:k], fit, v_max, key)
+    except ServerBusy:
+        st.warning("The server is busy; the plot will refresh on the next interaction.")
+        return
+    with span("plotly_chart"):
+        st.plotly_chart(fig, use_container_width=True)
+    st.caption(describe(stats))
+    if fit is None:
+        st.info("No break in the curve yet: keep adding titrant past the equivalence point.")
 
 # ---------------------------------------------------------------------
 # PLOTS TAB
 # ---------------------------------------------------------------------
-with tabs[2]:
+@st.fragment
+@profiled("Plots")
+def plots_tab(noise, law):
     st.header("Plots")
-
-    df2 = pd.DataFrame(st.session_state.get("table2",[]),
-                       columns=["Volume (mL)","Concentration (M)","Conductance Λ (S·cm²·mol⁻¹)","Temperature (K)"])
-    
-    if len(df2)>=2:
-        df2["Concentration (M)"] = df2["Concentration (M)"].astype(float)
-        df2["Conductance Λ (S·cm²·mol⁻¹)"] = df2["Conductance Λ (S·cm²·mol⁻¹)"].astype(float)
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=df2["Concentration (M)"],
-            y=df2["Conductance Λ (S·cm²·mol⁻¹)"],
-            mode="markers+lines",
-            name="Measured"
-        ))
-
-        coeffs = np.polyfit(df2["Concentration (M)"], df2["Conductance Λ (S·cm²·mol⁻¹)"], 1)
-        xfit = np.linspace(df2["Concentration (M)"].min(), df2["Concentration (M)"].max(), 50)
-        yfit = np.polyval(coeffs, xfit)
-
-        fig.add_trace(go.Scatter(x=xfit,y=yfit,mode="lines",line=dict(dash="dash"),name="Trend"))
-
-        fig.update_layout(title="NaCl: Variation of Conductance with Concentration",
-                          xaxis_title="Concentration (M)",
-                          yaxis_title="Conductance Λ (S·cm²·mol⁻¹)",
-                          template="plotly_white")
-        fig.update_xaxes(autorange="reversed")
-        st.plotly_chart(fig, use_container_width=True)
-    else:
-        st.info("Perform dilution experiment to view plot.")
-
-    if len(dfT:=pd.DataFrame(st.session_state.get("temp_table",[]),
-                     columns=["Temperature (K)","Conductance Λ (S·cm²·mol⁻¹)"])) >=1:
-
-        dfT["Temperature (K)"] = dfT["Temperature (K)"].astype(float)
-        dfT["Conductance Λ (S·cm²·mol⁻¹)"] = dfT["Conductance Λ (S·cm²·mol⁻¹)"].astype(float)
-
-        fig2 = go.Figure()
-        fig2.add_trace(go.Scatter(x=dfT["Temperature (K)"],
-                                  y=dfT["Conductance Λ (S·cm²·mol⁻¹)"],
-                                  mode="markers+lines", name="Measured"))
-        
-        if len(dfT)>=2:
-            coeffs2 = np.polyfit(dfT["Temperature (K)"], dfT["Conductance Λ (S·cm²·mol⁻¹)"],1)
-            xfit = np.linspace(dfT["Temperature (K)"].min(), dfT["Temperature (K)"].max(),50)
-            yfit = np.polyval(coeffs2, xfit)
-            fig2.add_trace(go.Scatter(x=xfit,y=yfit,mode="lines",line=dict(dash="dash"),name="Trend"))
-
-        fig2.update_layout(title="KCl: Conductance vs Temperature",
-                           xaxis_title="Temperature (K)",
-                           yaxis_title="Conductance Λ (S·cm²·mol⁻¹)",
-                           template="plotly_white")
-        st.plotly_chart(fig2, use_container_width=True)
+    band = noise[:2] if noise else None
+
+    table2 = st.session_state.table2
+    temp_table = st.session_state.temp_table
+    try:
+        if len(table2)>=2:
+            with span("dilution_figure"):
+                fig, stats = run(dilution_figure, table2, st.session_state.fit2, band, law)
+            with span("plotly_chart"):
+                st.plotly_chart(fig, use_container_width=True)
+            st.caption(describe(stats))
+        else:
+            st.info("Perform dilution experiment to view plot.")
+
+        if len(temp_table)>=1:
+            with span("temperature_figure"):
+                fig2, stats2 = run(temperature_figure, temp_table, st.session_state.fit_temp, band, law)
+            with span("plotly_chart"):
+                st.plotly_chart(fig2, use_container_width=True)
+            st.caption(describe(stats2))
+    except ServerBusy:
+        st.warning("The server is busy; plots will refresh on the next interaction.")
 
 # ---------------------------------------------------------------------
 # REPORT TAB
 # ---------------------------------------------------------------------
-with tabs[3]:
+@st.fragment
+@profiled("Reports")
+def report_tab():
     st.header("Report")
 
     st.subheader("Table 1: 0.1M Solutions")
-    df1 = pd.DataFrame(st.session_state.table1,
-                       columns=["Salt","Conductance Λ (S·cm²·mol⁻¹)","Temperature (K)"])
+    df1 = st.session_state.table1.to_frame()
     st.table(df1)
 
     st.subheader("Table 2: NaCl Dilution")
-    df2 = pd.DataFrame(st.session_state.table2,
-                       columns=["Volume (mL)","Concentration (M)","Conductance Λ (S·cm²·mol⁻¹)","Temperature (K)"])
+    df2 = st.session_state.table2.to_frame()
     st.table(df2)
 
     st.subheader("Temperature Data (KCl)")
-    dfT = pd.DataFrame(st.session_state.temp_table,
-                       columns=["Temperature (K)","Conductance Λ (S·cm²·mol⁻¹)"])
+    dfT = st.session_state.temp_table.to_frame()
     st.table(dfT)
 
+    download_buttons("lab report", {"table1": st.session_state.table1,
+                                    "dilution": st.session_state.table2,
+                                    "temperature": st.session_state.temp_table},
+                     "conductance_report", formats=("zip", "xlsx"))
+
     st.subheader("Result")
     st.write("""
     From table 1, the cation with the highest conducting ability can be identified.
@@ -288,3 +341,32 @@ with tabs[3]:
             st.write("- Conductance increases with dilution due to increased ion mobility at lower concentration.")
         if len(dfT)>1:
             st.write("- Conductance increases with temperature due to enhanced ion mobility.")
+
+    if history_enabled():
+        st.subheader("Class Results (all saved runs)")
+        cohort_table("0.1M solutions", "standards", "label", "Salt", "Λ")
+        cohort_table("NaCl dilution", "dilution", "concentration", "Concentration (M)", "Λ")
+        cohort_table("KCl temperature series", "temperature", "temperature", "Temperature (K)", "Λ")
+
+# ---------------------------------------------------------------------
+# LAYOUT
+# ---------------------------------------------------------------------
+tabs = st.tabs(["Theory","Experiments","Plots","Reports"])
+
+with tabs[0]:
+    theory_tab(template_choice, show_help)
+
+with tabs[1]:
+    st.header("Experiment")
+    experiment_a(noise, law)
+    experiment_b(noise, law)
+    experiment_c(noise, law)
+    experiment_d(noise)
+
+with tabs[2]:
+    plots_tab(noise, law)
+
+with tabs[3]:
+    report_tab()
+
+profiler_panel()
@@ -1,13 +1,20 @@
 import streamlit as st
-from math import log, exp
-import matplotlib.pyplot as plt
 import random
-from PIL import Image
-import pandas as pd
 import numpy as np
-import plotly.graph_objects as go
 import os
 
+from chemlab.assets import load_image
+from chemlab.figures import describe, discharge_figure, emf_figure
+from chemlab.kinetics import cached_discharge, discharge_frame
+from chemlab.noise import emf_readings, summarize
+from chemlab.profiling import profiled, span
+from chemlab.nernst import T, conc_anode, conc_from_emf, ln_ratio, nernst
+from chemlab.regression import OnlineFit
+from chemlab.ui import (cohort_table, download_buttons, flash, forget, history_enabled, history_status,
+                        new_table, noise_controls, nonideal_controls, persist, profiler_panel, profiler_toggle,
+                        restore, server_metrics, show_flash)
+from chemlab.workers import ServerBusy, run
+
 st.title("⚡ Electrochemistry Simulator")
 st.write("Daniell Cell and Nernst Equation Experiments")
 
@@ -15,18 +22,43 @@ st.write("Daniell Cell and Nernst Equation Experiments")
 st.sidebar.header("Simulator Controls")
 template_choice = st.sidebar.selectbox("Layout template", ["Default", "Compact"], index=0)
 show_help = st.sidebar.checkbox("Show help panels", value=True)
+profiler_toggle()
+noise = noise_controls()
+law = nonideal_controls(cell=True) or nernst
+history_status()
+
+conc_map = {"0.1 M": 0.1, "0.01 M": 0.01, "0.001 M": 0.001}
 
 def lbl2conc(lbl):
     if lbl == "Sample":
         return st.session_state.sample_conc
-    return float(lbl.split()[0])
-
-# Constants
-conc_anode = 0.1
-
-tabs = st.tabs(["Theory", "Experiment", "Plots", "Results"])
-
-with tabs[0]:
+    return conc_map[lbl]
+
+# persistent sample concentration
+if "sample_conc" not in st.session_state:
+    st.session_state.sample_conc = random.uniform(0.001, 0.1)
+
+if "exp_data" not in st.session_state:
+    st.session_state.exp_data = new_table("exp_data", ["Concentration (M)", "EMF (V)"], [object, float], capacity=4)
+    # calibration line over the standards, EMF vs ln([Zn²⁺]/[Cu²⁺])
+    st.session_state.std_fit = OnlineFit()
+    saved = restore("emf", latest_per_label=True)
+    if saved is not None:
+        st.session_state.exp_data.extend(saved["label"].to_numpy(object), saved["value"])
+        standards = saved[saved["label"] != "Sample"]
+        st.session_state.std_fit = OnlineFit.from_arrays(
+            ln_ratio(conc_anode, standards["concentration"]), standards["value"])
+        sample = saved[saved["label"] == "Sample"]
+        if len(sample):
+            st.session_state.sample_conc = float(sample["concentration"].iloc[0])
+server_metrics(st.session_state.exp_data)
+
+# Tabs and the standards/sample blocks are fragments; adding or clearing data
+# reruns the whole app via `flash` so Plots and Results pick it up.
+
+@st.fragment
+@profiled("Theory")
+def theory_tab(template_choice):
     st.header("Aim")
     st.markdown("""
 To build a Daniell electrochemical cell, to verify the Nernst equation and to find the  
@@ -49,11 +81,13 @@ For this cell, Q = [Zn²⁺]/[Cu²⁺], so:
 **E = 1.10 - (0.0257) ln([Zn²⁺]/[Cu²⁺]) V** at 25°C
 
 By measuring EMF at different concentrations and plotting E vs ln([Zn²⁺]/[Cu²⁺]), we can verify the Nernst equation and determine unknown concentrations.
+
+Strictly, Q is a ratio of activities, aᵢ = γᵢ[ion]. At 0.1 M the 2:2 sulfates give an ionic strength of 0.4 M and γ ≈ 0.3, so real cells deviate from the ideal line. Turn on **Non-ideal solutions** in the sidebar to use Davies or extended Debye–Hückel activity coefficients, with optional KNO₃ from the salt bridge.
 """)
 
     img_path = "images/electrochem.png"
     if os.path.exists(img_path):
-        img = Image.open(img_path)
+        img = load_image(img_path)
         if template_choice == "Compact":
             st.image(img, width=400)
         else:
@@ -87,106 +121,188 @@ Multimeter, Copper rod, Zinc rod, 0.1 M Zinc sulphate solution, 0.1 M, 0.01 M an
 """)
     st.info("Proceed to the Experiment tab to perform this simulation.")
 
-with tabs[1]:
-    st.header("Experiment")
+def measure_emf(cathode, noise, law):
+    """EMF reading; in noise mode the mean of n replicate multimeter readings."""
+    if not noise:
+        return float(law(conc_anode, cathode, T))
+    n, _, rng = noise
+    return float(summarize(emf_readings(rng, cathode, conc_anode, T, n, law=law))[0])
 
-    def nernst(E0, R, T, n, F, anode, cathode):
-        return E0 - (R * T) / (n * F) * log(anode / cathode)
 
-    conc_map = {"0.1 M": 0.1, "0.01 M": 0.01, "0.001 M": 0.001}
+def record_standard(label, emf):
+    data, fit = st.session_state.exp_data, st.session_state.std_fit
+    x = float(ln_ratio(conc_anode, conc_map[label]))
+    if label in data:
+        fit.remove(x, data.row(label)[1])
+    data.upsert(label, emf)
+    fit.add(x, emf)
+    persist("emf", emf, label=label, concentration=conc_map[label], temperature=T)
 
-    Enot = 1.10
-    R, T, n, F = 8.314, 298, 2, 96485
 
+@st.fragment
+@profiled("Standards")
+def standards_block(noise, law):
     conc_choice = st.selectbox("Select CuSO₄ concentration:", list(conc_map.keys()))
+    if st.button("Add Experiment Data"):
+        emf = measure_emf(conc_map[conc_choice], noise, law)
+        record_standard(conc_choice, emf)
+        flash("flash_std", "Data added")
+    show_flash("flash_std")
+
+
+@st.fragment
+@profiled("Sample")
+def sample_block(noise, law):
+    if st.button("Add Sample Data"):
+        emf = measure_emf(st.session_state.sample_conc, noise, law)
+        st.session_state.exp_data.upsert("Sample", emf)
+        persist("emf", emf, label="Sample", concentration=st.session_state.sample_conc, temperature=T)
+        flash("flash_sample", "Sample added")
+    show_flash("flash_sample")
+
+
+@profiled("Experiment")
+def experiment_tab(noise, law):
+    st.header("Experiment")
 
-    # persistent sample concentration
-    if "sample_conc" not in st.session_state:
-        st.session_state.sample_conc = random.uniform(0.001, 0.1)
-
-    sample_conc = st.session_state.sample_conc
-
-    if "exp_data" not in st.session_state:
-        st.session_state.exp_data = {}
     cols = st.columns(2)
     with cols[0]:
-        if st.button("Add Experiment Data"):
-            emf = nernst(Enot, R, T, n, F, conc_anode, conc_map[conc_choice])
-            st.session_state.exp_data[conc_choice] = emf
-
-            st.success("Data added")
+        standards_block(noise, law)
     with cols[1]:
-        if st.button("Add Sample Data"):
-            emf = nernst(Enot, R, T, n, F, conc_anode, sample_conc)
-            st.session_state.exp_data["Sample"] = emf
-            st.success("Sample added")
+        sample_block(noise, law)
 
     if st.session_state.exp_data:
-        data_list = [{"Concentration (M)": k,"[Zn²⁺]/[Cu²⁺]": conc_anode/lbl2conc(k), "ln([Zn²⁺]/[Cu²⁺])": log(conc_anode/lbl2conc(k)), "EMF (V)": v} for k, v in st.session_state.exp_data.items()]
-        df = pd.DataFrame(data_list)
+        df = st.session_state.exp_data.to_frame()
+        concs = np.array([lbl2conc(k) for k in df["Concentration (M)"]])
+        df.insert(1, "[Zn²⁺]/[Cu²⁺]", conc_anode / concs)
+        df.insert(2, "ln([Zn²⁺]/[Cu²⁺])", ln_ratio(conc_anode, concs))
         st.dataframe(df)
-        st.download_button("Download Data as CSV", df.to_csv(index=False).encode('utf-8'), "experiment_data.csv", "text/csv")
+        download_buttons("Data", {"experiment_data": df}, "experiment_data")
     else:
         st.info("No experiment data added yet.")
     if st.button("Clear Data"):
-        st.session_state.exp_data = {}
+        st.session_state.exp_data.clear()
+        st.session_state.std_fit.clear()
         st.session_state.sample_conc = random.uniform(0.001, 0.1)
-        st.success("Cleared")
+        forget("emf")
+        flash("flash_clear", "Cleared")
+    show_flash("flash_clear")
 
 
-with tabs[2]:
+@st.fragment
+@profiled("Plots")
+def plots_tab(noise, law):
     if st.session_state.exp_data:
         data = st.session_state.exp_data
-        labels = list(data.keys())
-        emf_vals = list(data.values())
-
-        concs = [lbl2conc(lbl) for lbl in labels]
-        x_vals = [log(conc_anode/c) for c in concs]
-
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(x=x_vals, y=emf_vals, mode='lines+markers', name='Data Points',
-                                 hovertemplate='ln([Zn²⁺]/[Cu²⁺]): %{x:.2f}<br>EMF: %{y:.3f} V<extra></extra>'))
-        if "Sample" in labels:
-            i = labels.index("Sample")
-            fig.add_vline(x=x_vals[i], line_dash="dash", annotation_text="Sample",
-                          annotation_position="top right")
-        fig.update_layout(
-            title="EMF vs ln Concentration Ratio",
-            xaxis_title="ln([Zn²⁺]/[Cu²⁺])",
-            yaxis_title="EMF (V)",
-            showlegend=False
-        )
-        st.plotly_chart(fig)
+        labels = data.column("Concentration (M)").tolist()
+        x_vals = ln_ratio(conc_anode, np.array([lbl2conc(lbl) for lbl in labels]))
+        points = tuple(zip(labels, x_vals.tolist(), data.column("EMF (V)").tolist()))
+        try:
+            with span("emf_figure"):
+                fig, stats = run(emf_figure, points, st.session_state.std_fit,
+                                 noise[:2] if noise else None, law)
+        except ServerBusy:
+            st.warning("The server is busy; the plot will refresh on the next interaction.")
+            return
+        with span("plotly_chart"):
+            st.plotly_chart(fig)
+        st.caption(describe(stats))
     else:
         st.info("No experiment data to plot yet.")
 
 
-with tabs[3]:
+@st.fragment
+@profiled("Discharge")
+def discharge_block():
+    st.subheader("Discharge under Load")
+    st.write("The cell drives a current through each load resistance. Cu²⁺ plates out and Zn²⁺ builds up, so the EMF falls over time.")
+    if not st.toggle("Simulate discharge", value=False, key="discharge_on"):
+        return
+    loads = st.multiselect("Load resistances (Ω)", [1, 5, 10, 20, 50, 100, 200, 500, 1000],
+                           default=[10, 50, 200])
+    cols = st.columns(3)
+    hours = cols[0].slider("Duration (h)", min_value=1, max_value=96, value=24)
+    steps = cols[1].selectbox("Timesteps", [1_000, 10_000, 100_000], index=2)
+    cathode = cols[2].selectbox("Initial [Cu²⁺]", list(conc_map), index=0)
+    if not loads:
+        st.info("Select at least one load resistance.")
+        return
+
+    args = (tuple(sorted(loads)), float(hours), steps, conc_map[cathode])
+    try:
+        with span("discharge"):
+            result = run(cached_discharge, *args)
+            fig, stats = run(discharge_figure, result, args[0], args)
+    except ServerBusy:
+        st.warning("The server is busy; the discharge curves will refresh on the next interaction.")
+        return
+    with span("plotly_chart"):
+        st.plotly_chart(fig)
+    st.caption(describe(stats))
+
+    st.dataframe({"Load (Ω)": args[0],
+                  "Final EMF (V)": result["emf"][:, -1].round(4),
+                  "Final current (mA)": (result["current"][:, -1] * 1e3).round(3),
+                  "Charge passed (C)": result["charge"][:, -1].round(1),
+                  "[Cu²⁺] left (M)": result["cathode"][:, -1]}, hide_index=True)
+    download_buttons("discharge data", lambda: {"discharge": discharge_frame(result, args[0])},
+                     "discharge", formats=("parquet", "csv"))
+
+
+@st.fragment
+@profiled("Results")
+def results_tab():
     st.header("Results")
 
     if "Sample" not in st.session_state.exp_data:
         st.warning("Add sample data to compute results.")
     else:
         st.markdown("""<div style="border: 2px solid #4CAF50; padding: 20px; border-radius: 10px; background-color: #f0f8f0;">""", unsafe_allow_html=True)
-        emf_sample = st.session_state.exp_data["Sample"]
+        emf_sample = st.session_state.exp_data.row("Sample")[1]
 
         # regression using known standards
-        standards = [(lbl2conc(k), v) for k, v in st.session_state.exp_data.items() if k != "Sample"]
-        conc_std = [c for c,_ in standards]
-        emf_std = [e for _,e in standards]
-        x_std = [log(conc_anode/c) for c in conc_std]
+        fit = st.session_state.std_fit
 
-        if len(x_std) < 2:
+        if fit.n < 2:
             st.error("Please add at least two standard measurements before adding the sample.")
         else:
-            m, b = np.polyfit(x_std, emf_std, 1)
-            x_sample = (emf_sample - b) / m
-            cu_conc = conc_anode / exp(x_sample)
-
-            st.success(f"Calculated Sample CuSO₄ Concentration ≈ **{cu_conc:.4f} M**")
+            cu_conc = float(conc_from_emf(emf_sample, fit.slope, fit.intercept))
+            _, x_se = fit.inverse(emf_sample)
+            # d[Cu²⁺]/dx = -[Cu²⁺] for x = ln([Zn²⁺]/[Cu²⁺])
+            cu_se = cu_conc * x_se
+
+            if cu_se == cu_se:
+                st.success(f"Calculated Sample CuSO₄ Concentration ≈ **{cu_conc:.4f} ± {cu_se:.4f} M**")
+                st.write(f"Calibration: slope = {fit.slope:.5f} ± {fit.slope_se:.5f} V, "
+                         f"intercept = {fit.intercept:.4f} ± {fit.intercept_se:.4f} V, R² = {fit.r2:.5f}")
+            else:
+                st.success(f"Calculated Sample CuSO₄ Concentration ≈ **{cu_conc:.4f} M**")
+                st.caption("Add a third standard to estimate the uncertainty.")
 
             st.write("""
 (a) Nernst equation verified by observing change in EMF with concentration.  
 (b) Unknown sample concentration estimated using calibration plot.  
 """)
         st.markdown("</div>", unsafe_allow_html=True)
+
+    if history_enabled():
+        st.subheader("Class Results (all saved runs)")
+        cohort_table("EMF by solution (samples differ between runs)", "emf", "label", "Solution", "EMF (V)")
+
+
+tabs = st.tabs(["Theory", "Experiment", "Plots", "Results"])
+
+with tabs[0]:
+    theory_tab(template_choice)
+
+with tabs[1]:
+    experiment_tab(noise, law)
+
+with tabs[2]:
+    plots_tab(noise, law)
+    discharge_block()
+
+with tabs[3]:
+    results_tab()
+
+profiler_panel()